@@ -10,28 +10,40 @@ Usage:
     python convert_to_csv.py <input.bin> --json  # Output as JSON
 """
 
-import argparse
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from loadcell_parser import LogFile, to_csv, to_json
 
-
-def progress_bar(current: int, total: int, width: int = 50):
-    """Print a progress bar"""
-    if total == 0:
-        return
-    percent = current / total
-    filled = int(width * percent)
-    bar = '█' * filled + '░' * (width - filled)
-    sys.stdout.write(f'\r[{bar}] {percent*100:.1f}%')
-    sys.stdout.flush()
+class ProgressBar:
+    """
+    to_csv() progress callback printing a progress bar for one file,
+    redrawn only when what it shows changes.
+    """
+    
+    def __init__(self, width: int = 50):
+        self.width = width
+        self.shown = None   # (filled, percent text) last drawn, None before the first
+    
+    def __call__(self, current: int, total: int):
+        if total == 0:
+            return
+        percent = current / total
+        filled = int(self.width * percent)
+        shown = (filled, f'{percent*100:.1f}')
+        if shown == self.shown:
+            return
+        self.shown = shown
+        bar = '█' * filled + '░' * (self.width - filled)
+        sys.stdout.write(f'\r[{bar}] {shown[1]}%')
+        sys.stdout.flush()
 
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Convert loadcell binary log files to CSV/JSON',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -48,6 +60,9 @@ Examples:
     
     # Include IMU data in CSV
     python convert_to_csv.py data/log_001.bin --include-imu
+    
+    # Format CSV rows on 4 CPU cores
+    python convert_to_csv.py data/log_001.bin --jobs 4
 """
     )
     
@@ -61,8 +76,16 @@ Examples:
                        help='Include all sample data in JSON output')
     parser.add_argument('--quiet', '-q', action='store_true',
                        help='Suppress progress output')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                       help='Worker processes formatting CSV rows (default: 1)')
     
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("argument --jobs: must be at least 1")
+    
+    # Imported after argument parsing so --help and usage errors stay fast
+    from loadcell_parser import LogFile, to_csv, to_json
+    from loadcell_parser.export import CSV_BUFFER_SIZE
     
     input_path = Path(args.input)
     if not input_path.exists():
@@ -102,12 +125,15 @@ Examples:
         if args.json:
             to_json(log, str(output_path), include_data=args.include_data)
         else:
-            callback = None if args.quiet else lambda c, t: progress_bar(c, t)
-            rows = to_csv(log, str(output_path), 
-                         include_imu=args.include_imu,
-                         progress_callback=callback)
+            progress = None if args.quiet else ProgressBar()
+            with open(output_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as f:
+                rows = to_csv(log, f,
+                             include_imu=args.include_imu,
+                             progress_callback=progress,
+                             jobs=args.jobs)
             if not args.quiet:
-                print()  # Newline after progress bar
+                if progress.shown is not None:
+                    print()  # Newline after progress bar
                 print(f"  Wrote {rows:,} rows")
     except Exception as e:
         print(f"\nError writing output: {e}", file=sys.stderr)
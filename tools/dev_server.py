@@ -8,22 +8,41 @@ for local development and preview without ESP32 hardware.
 Usage:
     cd Loadcell_Datalogger_V1
     python tools/dev_server.py
+    DEVSERVER_QUIET=1 python tools/dev_server.py   # No per-request log lines
 
 Opens browser at http://localhost:8080
 """
 
+import gzip
 import http.server
-import socketserver
 import json
 import os
+import random
 import sys
+import threading
+import time
 import webbrowser
+import zlib
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PORT = 8080
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Skip the log line printed for every request (errors are still printed)
+QUIET = os.environ.get("DEVSERVER_QUIET") == "1"
+
+# Interval between /api/stream events (~20 Hz, as on the ESP32)
+STREAM_INTERVAL_S = 0.05
+
+# MAX11270 microvolts per LSB at unity gain (2.5 V reference, 24-bit)
+UV_PER_LSB = 2500000.0 / (1 << 23)
+
 # LED Test States (same as ESP32 implementation)
 LED_TEST_STATES = [
     {"color": "off", "pattern": "off", "blink_count": 0, "name": "Off"},
@@ -112,6 +131,15 @@ MOCK_DATA = {
     }
 }
 
+# Serializes POST handlers that mutate MOCK_DATA (requests run in threads)
+MOCK_DATA_LOCK = threading.Lock()
+
+# Random source for simulated live data and sensor test results
+RNG = random.Random()
+
+# Largest POST body read into memory (mock config/test requests are tiny)
+MAX_POST_BODY = 1024 * 1024
+
 # Passwords for mode switching (same as ESP32)
 PASSWORDS = {
     "factory": "factory123",
@@ -119,20 +147,184 @@ PASSWORDS = {
 }
 
 
+def _dumps(data) -> bytes:
+    """Serialize to compact JSON bytes (uses orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(body):
+    """Parse a JSON request body (uses orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+# CORS headers added to every response, encoded once
+DEV_HEADERS = (
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"Access-Control-Allow-Methods: GET, POST, PUT, DELETE, OPTIONS\r\n"
+    b"Access-Control-Allow-Headers: Content-Type\r\n"
+)
+
+# Caching headers: API responses are never stored; static files and
+# cached API bodies may be stored but are revalidated (ETag) on every use,
+# so changes show up immediately while unchanged ones cost a 304
+NO_STORE_HEADER = b"Cache-Control: no-cache, no-store, must-revalidate\r\n"
+REVALIDATE_HEADER = b"Cache-Control: no-cache\r\n"
+
+# Test state names by index
+LED_STATE_NAMES = tuple(state["name"] for state in LED_TEST_STATES)
+
+# JSON responses smaller than this are sent uncompressed (gzip framing
+# would outweigh the savings)
+GZIP_MIN_SIZE = 1024
+
+# Static files up to this size are kept in memory and sent with the
+# buffered headers; larger ones go out with sendfile()
+STATIC_CACHE_MAX_SIZE = 256 * 1024
+
+# Small static file contents: path -> ((mtime_ns, size), bytes)
+STATIC_CACHE = {}
+
+# GET /api/led bodies for every state: LED_STATE_JSON[cycling][state_index]
+LED_STATE_JSON = tuple(
+    tuple(
+        _dumps({
+            "state_index": i,
+            "state_count": len(LED_STATE_NAMES),
+            "state_name": name,
+            "cycling": cycling,
+        })
+        for i, name in enumerate(LED_STATE_NAMES)
+    )
+    for cycling in (False, True)
+)
+
+# Responses for endpoints whose mock data never changes, serialized once
+STATIC_JSON = {
+    '/api/sdcard': _dumps(MOCK_DATA["sdcard"]),
+    '/api/battery': _dumps(MOCK_DATA["battery"]),
+}
+
+# GET endpoints whose response only changes when a POST mutates MOCK_DATA
+CACHED_GET_PATHS = frozenset({
+    '/api/mode',
+    '/api/status',
+    '/api/config',
+    '/api/test/results',
+})
+
+# Serialized responses for CACHED_GET_PATHS, filled on first GET and
+# cleared by every API POST (guarded by MOCK_DATA_LOCK)
+JSON_CACHE = {}
+
+
 class WebUIHandler(http.server.SimpleHTTPRequestHandler):
     """Custom HTTP handler for WebUI development server"""
     
+    # Buffer the response so headers and body go out in one send() instead
+    # of one per write; handle_one_request() flushes after every request
+    wbufsize = 64 * 1024
+    
+    # TCP_NODELAY: small JSON responses shouldn't wait on Nagle/delayed ACKs
+    disable_nagle_algorithm = True
+    
+    # ETag of the current response (static files and cached API bodies)
+    response_etag = None
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=str(DATA_DIR), **kwargs)
     
     def end_headers(self):
-        # Add CORS headers for local development
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
+        # Add CORS/caching headers for local development (pre-encoded,
+        # appended to the header buffer that send_header() would otherwise fill)
+        if self.request_version != 'HTTP/0.9':
+            if self.response_etag is not None:
+                self.send_header("ETag", self.response_etag)
+                self._headers_buffer.append(REVALIDATE_HEADER)
+            else:
+                self._headers_buffer.append(NO_STORE_HEADER)
+            self._headers_buffer.append(DEV_HEADERS)
+        self.response_etag = None
         super().end_headers()
     
+    def copyfile(self, source, outputfile):
+        """Send static file bodies from memory (small files) or with sendfile()"""
+        try:
+            st = os.fstat(source.fileno())
+        except OSError:  # no file descriptor (e.g. directory listing)
+            st = None
+        
+        if st is not None and st.st_size <= STATIC_CACHE_MAX_SIZE:
+            # Reuse the cached contents while the file is unmodified
+            version = (st.st_mtime_ns, st.st_size)
+            cached = STATIC_CACHE.get(source.name)
+            if cached is None or cached[0] != version:
+                cached = STATIC_CACHE[source.name] = (version, source.read())
+            outputfile.write(cached[1])
+            return
+        
+        # Headers are still in the wfile buffer; they must go out first.
+        # socket.sendfile() falls back to send() for non-file sources.
+        outputfile.flush()
+        self.connection.sendfile(source)
+    
+    def etag_matches(self, etag: str) -> bool:
+        """Whether the request's If-None-Match lists etag"""
+        return etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(','))
+    
+    def accepts_gzip(self) -> bool:
+        """Whether the client accepts gzip-encoded responses"""
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+    
+    def send_head(self):
+        """
+        Serve static files with an ETag, answering 304 when the client's
+        copy is current. Clients that accept gzip get a precompressed
+        '<file>.gz' sibling when one exists.
+        """
+        path = self.translate_path(self.path)
+        source = path
+        if self.accepts_gzip() and os.path.isfile(path + '.gz'):
+            source = path + '.gz'
+        
+        try:
+            st = os.stat(source)
+        except OSError:
+            st = None
+        if st is None or not os.path.isfile(source):
+            return super().send_head()
+        
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        if self.etag_matches(etag):
+            self.response_etag = etag
+            self.send_response(304)
+            if source != path:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return None
+        
+        self.response_etag = etag
+        if source == path:
+            return super().send_head()
+        
+        try:
+            f = open(source, 'rb')
+        except OSError:
+            self.response_etag = None
+            return super().send_head()
+        fs = os.fstat(f.fileno())
+        self.send_response(200)
+        self.send_header("Content-type", self.guess_type(path))
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(fs.st_size))
+        self.send_header("Last-Modified", self.date_time_string(fs.st_mtime))
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return f
+    
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
         self.send_response(200)
@@ -144,6 +336,9 @@ class WebUIHandler(http.server.SimpleHTTPRequestHandler):
         path = parsed.path
         
         # API endpoints
+        if path == '/api/stream':
+            self.handle_stream()
+            return
         if path.startswith('/api/'):
             self.handle_api_get(path)
             return
@@ -168,209 +363,339 @@ class WebUIHandler(http.server.SimpleHTTPRequestHandler):
     
     def handle_api_get(self, path):
         """Handle API GET requests with mock data"""
-        response = None
-        
-        if path == '/api/mode':
-            response = {"mode": MOCK_DATA["mode"]}
-        
-        elif path == '/api/status':
-            response = MOCK_DATA["status"].copy()
-            response["demo_mode"] = True  # Indicate running locally
-        
-        elif path == '/api/config':
-            response = MOCK_DATA["config"]
-        
-        elif path == '/api/sdcard':
-            response = MOCK_DATA["sdcard"]
-        
-        elif path == '/api/battery':
-            response = MOCK_DATA["battery"]
-        
-        elif path == '/api/test/results':
-            response = MOCK_DATA["test_results"]
-        
-        elif path == '/api/live':
-            # Simulated live data point
-            import random
-            response = {
-                "timestamp_ms": MOCK_DATA["status"]["uptime_ms"],
-                "load_kg": 500 + random.uniform(-10, 10),
-                "raw_adc": 5000000 + random.randint(-10000, 10000),
-                "accel_x": random.uniform(-0.1, 0.1),
-                "accel_y": random.uniform(-0.1, 0.1),
-                "accel_z": 1.0 + random.uniform(-0.05, 0.05)
-            }
-        
-        elif path == '/api/led':
-            # Get current LED state
-            idx = MOCK_DATA["led"]["state_index"]
-            state = LED_TEST_STATES[idx] if idx < len(LED_TEST_STATES) else LED_TEST_STATES[0]
-            response = {
-                "state_index": idx,
-                "state_count": len(LED_TEST_STATES),
-                "state_name": state["name"],
-                "cycling": MOCK_DATA["led"]["cycling"]
-            }
+        body = STATIC_JSON.get(path)
+        if body is None:
+            body = JSON_CACHE.get(path)
+        if body is not None:
+            self.send_json_bytes(body, revalidate=True)
+            return
         
-        else:
+        handler = self.GET_ROUTES.get(path)
+        if handler is None:
             self.send_error(404, f"API endpoint not found: {path}")
             return
         
-        self.send_json_response(response)
+        if path in CACHED_GET_PATHS:
+            # Serialize under the lock so a concurrent POST can't leave a
+            # stale body in the cache
+            with MOCK_DATA_LOCK:
+                body = JSON_CACHE[path] = _dumps(handler(self))
+            self.send_json_bytes(body, revalidate=True)
+            return
+        
+        response = handler(self)
+        if isinstance(response, bytes):
+            self.send_json_bytes(response)
+        else:
+            self.send_json_response(response)
+    
+    def handle_stream(self):
+        """
+        Server-Sent Events stream of simulated sensor data, in the same
+        format as the ESP32's /api/stream: one pushed 'data:' event per
+        sample over a single connection instead of a request per sample.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        
+        sample_rate_hz = 1000
+        start = time.monotonic()
+        try:
+            while True:
+                with MOCK_DATA_LOCK:
+                    logging = MOCK_DATA["status"]["logging"]
+                    gain = MOCK_DATA["config"]["adc_pga_gain"]
+                # Set by clients through POST /api/config; unity gain unless
+                # it is a positive number
+                if isinstance(gain, bool) or not isinstance(gain, (int, float)) or not gain > 0:
+                    gain = 1
+                raw_adc = 5000000 + RNG.randint(-10000, 10000)
+                event = {
+                    "adc": raw_adc,
+                    "uV": round(raw_adc * UV_PER_LSB / gain, 1),
+                    "ax": round(RNG.uniform(-0.1, 0.1), 3),
+                    "ay": round(RNG.uniform(-0.1, 0.1), 3),
+                    "az": round(1.0 + RNG.uniform(-0.05, 0.05), 3),
+                    "gx": round(RNG.uniform(-1, 1), 1),
+                    "gy": round(RNG.uniform(-1, 1), 1),
+                    "gz": round(RNG.uniform(-1, 1), 1),
+                    "t": int((time.monotonic() - start) * 1000),
+                    "logging": logging,
+                    "buf_pct": round(RNG.uniform(5, 15), 1) if logging else 0.0,
+                    "latency_us": RNG.randint(800, 1500) if logging else 0,
+                    "drops": 0,
+                    "sample_rate_hz": sample_rate_hz,
+                }
+                # Unbuffered: nothing is left in wfile for finish() to flush
+                # into a closed socket
+                self.connection.sendall(b"data: " + _dumps(event) + b"\n\n")
+                time.sleep(STREAM_INTERVAL_S)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client disconnected (EventSource closed or page left)
     
     def handle_api_post(self, path):
         """Handle API POST requests"""
-        content_length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(content_length).decode('utf-8') if content_length > 0 else '{}'
+        try:
+            content_length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self.send_error(400, "Invalid Content-Length")
+            return
+        if content_length > MAX_POST_BODY:
+            self.send_error(413, "Request body too large")
+            return
+        
+        # Both parsers take bytes directly; no separate decode pass needed
+        body = self.rfile.read(content_length) if content_length > 0 else b'{}'
         
         try:
-            data = json.loads(body) if body else {}
-        except json.JSONDecodeError:
+            data = _loads(body) if body else {}
+        except ValueError:  # JSONDecodeError (also raised by orjson) or bad UTF-8
             self.send_error(400, "Invalid JSON")
             return
         
-        response = None
-        
-        if path == '/api/mode':
-            # Mode switching with password validation
-            new_mode = data.get('mode', '').lower()
-            password = data.get('password', '')
-            
-            if new_mode == 'user':
-                MOCK_DATA["mode"] = "user"
-                MOCK_DATA["status"]["mode"] = "user"
-                response = {"success": True, "mode": "user"}
-            
-            elif new_mode in ['factory', 'admin']:
-                if password == PASSWORDS.get(new_mode):
-                    MOCK_DATA["mode"] = new_mode
-                    MOCK_DATA["status"]["mode"] = new_mode
-                    response = {"success": True, "mode": new_mode}
-                else:
-                    response = {"success": False, "error": "Invalid password"}
-            else:
-                response = {"success": False, "error": "Invalid mode"}
-        
-        elif path == '/api/config':
-            # Save configuration (just update mock data)
-            for key in data:
-                if key in MOCK_DATA["config"]:
-                    MOCK_DATA["config"][key] = data[key]
-            response = {"success": True}
-        
-        elif path.startswith('/api/test/'):
-            # Sensor tests
-            sensor = path.split('/')[-1]
-            if sensor in ['adc', 'imu', 'rtc', 'sd', 'neopixel']:
-                # Simulate test result (random pass/fail for demo)
-                import random
-                passed = random.random() > 0.1  # 90% pass rate
-                result = {
-                    "sensor": sensor,
-                    "passed": passed,
-                    "message": f"{sensor.upper()} test {'passed' if passed else 'failed'}",
-                    "details": {}
-                }
-                if sensor == 'adc':
-                    result["details"] = {"raw_value": 8388608, "noise_uV": 0.5}
-                elif sensor == 'imu':
-                    result["details"] = {"accel_z": 1.0, "gyro_bias": [0.1, -0.2, 0.05]}
-                elif sensor == 'rtc':
-                    result["details"] = {"time": "2024-12-31T12:00:00", "valid": True}
-                elif sensor == 'sd':
-                    result["details"] = {"type": "SDHC", "size_gb": 32}
-                elif sensor == 'neopixel':
-                    result["details"] = {"colors_tested": 6}
-                
-                MOCK_DATA["test_results"][sensor] = result
-                response = result
-            else:
-                response = {"success": False, "error": f"Unknown sensor: {sensor}"}
+        handler = self.POST_ROUTES.get(path)
+        if handler is None and path.startswith('/api/test/'):
+            handler = WebUIHandler._post_test
+        if handler is None:
+            self.send_error(404, f"API endpoint not found: {path}")
+            return
         
-        elif path == '/api/logging/start':
-            MOCK_DATA["status"]["logging"] = True
-            response = {"success": True, "message": "Logging started (demo)"}
+        # The body is already read: a slow client never holds the lock
+        with MOCK_DATA_LOCK:
+            JSON_CACHE.clear()
+            response = handler(self, path, data)
+        self.send_json_response(response)
+    
+    # GET handlers: return a response object or pre-serialized JSON bytes
+    
+    def _get_mode(self):
+        return {"mode": MOCK_DATA["mode"]}
+    
+    def _get_status(self):
+        response = MOCK_DATA["status"].copy()
+        response["demo_mode"] = True  # Indicate running locally
+        return response
+    
+    def _get_config(self):
+        return MOCK_DATA["config"]
+    
+    def _get_test_results(self):
+        return MOCK_DATA["test_results"]
+    
+    def _get_live(self):
+        # Simulated live data point
+        return {
+            "timestamp_ms": MOCK_DATA["status"]["uptime_ms"],
+            "load_kg": 500 + RNG.uniform(-10, 10),
+            "raw_adc": 5000000 + RNG.randint(-10000, 10000),
+            "accel_x": RNG.uniform(-0.1, 0.1),
+            "accel_y": RNG.uniform(-0.1, 0.1),
+            "accel_z": 1.0 + RNG.uniform(-0.05, 0.05)
+        }
+    
+    def _get_led(self):
+        # Get current LED state
+        led = MOCK_DATA["led"]
+        idx = led["state_index"]
+        cycling = led["cycling"]
+        if idx < len(LED_STATE_NAMES):
+            return LED_STATE_JSON[bool(cycling)][idx]
+        return {
+            "state_index": idx,
+            "state_count": len(LED_STATE_NAMES),
+            "state_name": LED_STATE_NAMES[0],
+            "cycling": cycling
+        }
+    
+    # POST handlers: take the request path and parsed body, return a response
+    
+    def _post_mode(self, path, data):
+        # Mode switching with password validation
+        new_mode = data.get('mode', '').lower()
+        password = data.get('password', '')
         
-        elif path == '/api/logging/stop':
-            MOCK_DATA["status"]["logging"] = False
-            response = {"success": True, "message": "Logging stopped (demo)"}
+        status = MOCK_DATA["status"]
         
-        elif path == '/api/led':
-            # Set LED color/pattern
-            if MOCK_DATA["mode"] != "factory":
-                response = {"success": False, "error": "LED test only available in Factory mode"}
-            else:
-                color = data.get("color", "off")
-                pattern = data.get("pattern", "steady")
-                blink_count = data.get("blink_count", 1)
-                
-                MOCK_DATA["led"]["color"] = color
-                MOCK_DATA["led"]["pattern"] = pattern
-                MOCK_DATA["led"]["blink_count"] = blink_count
-                MOCK_DATA["led"]["cycling"] = False
-                
-                # Find matching state name
-                state_name = f"{color.title()} {pattern.replace('_', ' ').title()}"
-                if pattern == "blink_code":
-                    state_name = f"Error Code {blink_count}"
-                
-                response = {
-                    "success": True,
-                    "color": color,
-                    "pattern": pattern,
-                    "blink_count": blink_count
-                }
+        if new_mode == 'user':
+            MOCK_DATA["mode"] = "user"
+            status["mode"] = "user"
+            return {"success": True, "mode": "user"}
         
-        elif path == '/api/led/next':
-            # Advance to next LED test state
-            if MOCK_DATA["mode"] != "factory":
-                response = {"success": False, "error": "LED test only available in Factory mode"}
-            else:
-                idx = MOCK_DATA["led"]["state_index"]
-                idx = (idx + 1) % len(LED_TEST_STATES)
-                MOCK_DATA["led"]["state_index"] = idx
-                
-                state = LED_TEST_STATES[idx]
-                response = {
-                    "success": True,
-                    "state_index": idx,
-                    "state_count": len(LED_TEST_STATES),
-                    "state_name": state["name"]
-                }
+        if new_mode in ['factory', 'admin']:
+            if password == PASSWORDS.get(new_mode):
+                MOCK_DATA["mode"] = new_mode
+                status["mode"] = new_mode
+                return {"success": True, "mode": new_mode}
+            return {"success": False, "error": "Invalid password"}
         
-        elif path == '/api/led/cycle/start':
-            # Start auto-cycling
-            if MOCK_DATA["mode"] != "factory":
-                response = {"success": False, "error": "LED test only available in Factory mode"}
-            else:
-                interval = data.get("interval_ms", 1500)
-                MOCK_DATA["led"]["cycling"] = True
-                response = {
-                    "success": True,
-                    "cycling": True,
-                    "interval_ms": interval
-                }
+        return {"success": False, "error": "Invalid mode"}
+    
+    def _post_config(self, path, data):
+        # Save configuration (just update mock data)
+        config = MOCK_DATA["config"]
+        for key, value in data.items():
+            if key in config:
+                config[key] = value
+        return {"success": True}
+    
+    def _post_test(self, path, data):
+        # Sensor tests
+        sensor = path.split('/')[-1]
+        if sensor not in ['adc', 'imu', 'rtc', 'sd', 'neopixel']:
+            return {"success": False, "error": f"Unknown sensor: {sensor}"}
         
-        elif path == '/api/led/cycle/stop':
-            # Stop auto-cycling
-            MOCK_DATA["led"]["cycling"] = False
-            response = {
-                "success": True,
-                "cycling": False
-            }
+        # Simulate test result (random pass/fail for demo)
+        passed = RNG.random() > 0.1  # 90% pass rate
+        result = {
+            "sensor": sensor,
+            "passed": passed,
+            "message": f"{sensor.upper()} test {'passed' if passed else 'failed'}",
+            "details": {}
+        }
+        if sensor == 'adc':
+            result["details"] = {"raw_value": 8388608, "noise_uV": 0.5}
+        elif sensor == 'imu':
+            result["details"] = {"accel_z": 1.0, "gyro_bias": [0.1, -0.2, 0.05]}
+        elif sensor == 'rtc':
+            result["details"] = {"time": "2024-12-31T12:00:00", "valid": True}
+        elif sensor == 'sd':
+            result["details"] = {"type": "SDHC", "size_gb": 32}
+        elif sensor == 'neopixel':
+            result["details"] = {"colors_tested": 6}
         
-        else:
-            self.send_error(404, f"API endpoint not found: {path}")
-            return
+        MOCK_DATA["test_results"][sensor] = result
+        return result
+    
+    def _post_logging_start(self, path, data):
+        MOCK_DATA["status"]["logging"] = True
+        return {"success": True, "message": "Logging started (demo)"}
+    
+    def _post_logging_stop(self, path, data):
+        MOCK_DATA["status"]["logging"] = False
+        return {"success": True, "message": "Logging stopped (demo)"}
+    
+    def _post_led(self, path, data):
+        # Set LED color/pattern
+        if MOCK_DATA["mode"] != "factory":
+            return {"success": False, "error": "LED test only available in Factory mode"}
         
-        self.send_json_response(response)
+        color = data.get("color", "off")
+        pattern = data.get("pattern", "steady")
+        blink_count = data.get("blink_count", 1)
+        if (not isinstance(color, str) or not isinstance(pattern, str)
+                or isinstance(blink_count, bool) or not isinstance(blink_count, int)):
+            return {"success": False, "error": "Invalid LED setting"}
+        
+        led = MOCK_DATA["led"]
+        led["color"] = color
+        led["pattern"] = pattern
+        led["blink_count"] = blink_count
+        led["cycling"] = False
+        
+        return {
+            "success": True,
+            "color": color,
+            "pattern": pattern,
+            "blink_count": blink_count
+        }
+    
+    def _post_led_next(self, path, data):
+        # Advance to next LED test state
+        if MOCK_DATA["mode"] != "factory":
+            return {"success": False, "error": "LED test only available in Factory mode"}
+        
+        led = MOCK_DATA["led"]
+        idx = (led["state_index"] + 1) % len(LED_STATE_NAMES)
+        led["state_index"] = idx
+        
+        return {
+            "success": True,
+            "state_index": idx,
+            "state_count": len(LED_STATE_NAMES),
+            "state_name": LED_STATE_NAMES[idx]
+        }
+    
+    def _post_led_cycle_start(self, path, data):
+        # Start auto-cycling
+        if MOCK_DATA["mode"] != "factory":
+            return {"success": False, "error": "LED test only available in Factory mode"}
+        
+        interval = data.get("interval_ms", 1500)
+        MOCK_DATA["led"]["cycling"] = True
+        return {
+            "success": True,
+            "cycling": True,
+            "interval_ms": interval
+        }
+    
+    def _post_led_cycle_stop(self, path, data):
+        # Stop auto-cycling
+        MOCK_DATA["led"]["cycling"] = False
+        return {
+            "success": True,
+            "cycling": False
+        }
+    
+    # Path -> handler dispatch tables (POST /api/test/<sensor> is matched
+    # by prefix in handle_api_post)
+    GET_ROUTES = {
+        '/api/mode': _get_mode,
+        '/api/status': _get_status,
+        '/api/config': _get_config,
+        '/api/test/results': _get_test_results,
+        '/api/live': _get_live,
+        '/api/led': _get_led,
+    }
+    
+    POST_ROUTES = {
+        '/api/mode': _post_mode,
+        '/api/config': _post_config,
+        '/api/logging/start': _post_logging_start,
+        '/api/logging/stop': _post_logging_stop,
+        '/api/led': _post_led,
+        '/api/led/next': _post_led_next,
+        '/api/led/cycle/start': _post_led_cycle_start,
+        '/api/led/cycle/stop': _post_led_cycle_stop,
+    }
     
     def send_json_response(self, data, status=200):
         """Send JSON response"""
+        self.send_json_bytes(_dumps(data), status)
+    
+    def send_json_bytes(self, body: bytes, status=200, revalidate=False):
+        """
+        Send an already-serialized JSON response.
+        
+        With revalidate, the body gets an ETag (CRC of its bytes) and a
+        client that already holds it gets 304 Not Modified instead.
+        """
+        if revalidate:
+            self.response_etag = f'W/"{zlib.crc32(body):08x}"'
+            if self.etag_matches(self.response_etag):
+                self.send_response(304)
+                self.end_headers()
+                return
+        
+        gzipped = len(body) >= GZIP_MIN_SIZE and self.accepts_gzip()
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
+        
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode('utf-8'))
+        self.wfile.write(body)
+    
+    def log_request(self, code='-', size='-'):
+        """Log an accepted request (unless DEVSERVER_QUIET=1)"""
+        if not QUIET:
+            super().log_request(code, size)
     
     def log_message(self, format, *args):
         """Custom log format"""
@@ -410,7 +735,7 @@ def main():
 </body>
 </html>
 """)
-    
+
     print("=" * 50)
     print("  Loadcell Datalogger - WebUI Development Server")
     print("=" * 50)
@@ -427,6 +752,7 @@ def main():
     print("    GET  /api/battery       - Battery level")
     print("    POST /api/test/{s}      - Run sensor test")
     print("    GET  /api/live          - Live data point")
+    print("    GET  /api/stream        - Live data (Server-Sent Events)")
     print("    GET  /api/led           - LED test state")
     print("    POST /api/led           - Set LED color/pattern")
     print("    POST /api/led/next      - Next LED test state")
@@ -435,8 +761,9 @@ def main():
     print("  Press Ctrl+C to stop")
     print("=" * 50)
     
-    # Create server
-    with socketserver.TCPServer(("", PORT), WebUIHandler) as httpd:
+    # Create server (one thread per connection, so a long-lived request
+    # doesn't block asset fetches and API polls)
+    with http.server.ThreadingHTTPServer(("", PORT), WebUIHandler) as httpd:
         # Open browser
         webbrowser.open(f"http://localhost:{PORT}")
         
@@ -27,7 +27,8 @@ Example usage:
 from .parser import LogFile, FileHeader, ADCRecord, IMURecord, EventRecord, FileFooter
 from .validator import ValidationReport, validate_file
 from .analysis import find_peaks, PeakInfo
-from .export import to_csv, to_dataframe
+from .calibration import PiecewiseCalibration, PolynomialCalibration
+from .export import to_csv, to_json, to_dataframe
 
 __version__ = '1.0.0'
 __all__ = [
@@ -41,7 +42,10 @@ __all__ = [
     'validate_file',
     'find_peaks',
     'PeakInfo',
+    'PiecewiseCalibration',
+    'PolynomialCalibration',
     'to_csv',
+    'to_json',
     'to_dataframe',
 ]
 
@@ -7,11 +7,15 @@ Provides peak detection, statistics, and signal analysis for loadcell data.
 from dataclasses import dataclass
 from typing import List, Optional, Tuple, Callable
 from .parser import LogFile, ADCRecord, IMURecord
+from .calibration import calibrate_array
 
 
 @dataclass
 class PeakInfo:
     """Information about a detected peak"""
+    # One instance per sample above threshold, so no per-instance __dict__
+    __slots__ = ('value', 'timestamp_s', 'record_index', 'raw_value')
+    
     value: float            # Peak value
     timestamp_s: float      # Timestamp in seconds
     record_index: int       # Index in record list
@@ -78,6 +82,65 @@ def raw_to_newtons(raw: int, calibration: Optional[Callable[[int], float]] = Non
     return kg * 9.81
 
 
+def _numpy():
+    """numpy module, or None if not installed (pure-Python loops are used instead)"""
+    try:
+        import numpy as np
+        return np
+    except ImportError:
+        return None
+
+
+def _loads_newtons(np, raw, calibration: Optional[Callable[[int], float]] = None):
+    """raw_to_newtons() over a whole raw ADC array"""
+    if calibration is None:
+        kg = raw / 1000000.0
+    else:
+        kg = calibrate_array(calibration, raw)
+    return kg * 9.81
+
+
+def _accel_arrays(np, imu, accel_scale: int = 0):
+    """(ax, ay, az, magnitude) arrays in g, as IMURecord.accel_g()/accel_magnitude_g()"""
+    factor = [0.061, 0.122, 0.244, 0.488][accel_scale] / 1000.0
+    ax = imu['accel_x'] * factor
+    ay = imu['accel_y'] * factor
+    az = imu['accel_z'] * factor
+    return ax, ay, az, np.sqrt(ax * ax + ay * ay + az * az)
+
+
+def _load_peaks(np, adc, loads, threshold_n: Optional[float]) -> LoadPeaks:
+    """
+    find_peaks() on ADC columns (or a structured ADC array) and their loads in Newtons.
+    
+    With threshold_n None, peaks_above_threshold is left empty.
+    """
+    result = LoadPeaks()
+    if len(loads) == 0:
+        return result
+    
+    raw = adc['raw_adc']
+    times = adc['timestamp_offset_us'] / 1_000_000
+    
+    # argmax/argmin return the first occurrence, like the strict
+    # comparisons in find_peaks()'s loop
+    i_max = int(loads.argmax())
+    i_min = int(loads.argmin())
+    result.max_load_n = float(loads[i_max])
+    result.max_load_time_s = float(times[i_max])
+    result.min_load_n = float(loads[i_min])
+    result.min_load_time_s = float(times[i_min])
+    
+    if threshold_n is not None:
+        indices = np.flatnonzero(np.abs(loads) >= threshold_n)
+        result.peaks_above_threshold = [
+            PeakInfo(value=value, timestamp_s=t, record_index=i, raw_value=r)
+            for value, t, i, r in zip(loads[indices].tolist(), times[indices].tolist(),
+                                      indices.tolist(), raw[indices].tolist())
+        ]
+    return result
+
+
 def find_peaks(log: LogFile, 
                threshold_n: float = 0.0,
                calibration: Optional[Callable[[int], float]] = None) -> LoadPeaks:
@@ -92,6 +155,12 @@ def find_peaks(log: LogFile,
     Returns:
         LoadPeaks with max/min values and peaks above threshold
     """
+    np = _numpy()
+    if np is not None:
+        adc = log.adc_columns
+        return _load_peaks(np, adc, _loads_newtons(np, adc['raw_adc'], calibration),
+                           threshold_n)
+    
     result = LoadPeaks()
     
     max_load = float('-inf')
@@ -150,6 +219,27 @@ def find_accel_peaks(log: LogFile,
     """
     result = AccelPeaks()
     
+    np = _numpy()
+    if np is not None:
+        imu = log.imu_columns
+        ax, ay, az, mags = _accel_arrays(np, imu, accel_scale)
+        times = imu['timestamp_offset_us'] / 1_000_000
+        
+        if len(mags):
+            i_max = int(mags.argmax())
+            if mags[i_max] > 0.0:
+                result.max_g = float(mags[i_max])
+                result.max_g_time_s = float(times[i_max])
+                result.max_component = (float(ax[i_max]), float(ay[i_max]), float(az[i_max]))
+        
+        indices = np.flatnonzero(mags >= threshold_g)
+        result.peaks_above_threshold = [
+            PeakInfo(value=value, timestamp_s=t, record_index=i, raw_value=0)
+            for value, t, i in zip(mags[indices].tolist(), times[indices].tolist(),
+                                   indices.tolist())
+        ]
+        return result
+    
     max_g = 0.0
     max_time = 0.0
     max_components = (0.0, 0.0, 0.0)
@@ -157,8 +247,10 @@ def find_accel_peaks(log: LogFile,
     peaks = []
     
     for i, imu in enumerate(log.iter_imu()):
+        # Magnitude from the same components (as accel_magnitude_g(),
+        # without converting the raw values a second time)
         ax, ay, az = imu.accel_g(accel_scale)
-        mag = imu.accel_magnitude_g(accel_scale)
+        mag = (ax**2 + ay**2 + az**2) ** 0.5
         
         if mag > max_g:
             max_g = mag
@@ -186,14 +278,33 @@ def compute_statistics(values: List[float]) -> Statistics:
     Compute statistical summary of values.
     
     Args:
-        values: List of numeric values
+        values: List (or numpy array) of numeric values
     
     Returns:
         Statistics dataclass
     """
-    if not values:
+    if len(values) == 0:
         return Statistics()
     
+    np = _numpy()
+    if np is not None:
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        mean = values.mean()
+        
+        # Sums of squares as dot products: no squared temporaries. The
+        # variance stays two-pass (about the mean) rather than
+        # E[x^2] - mean^2, which cancels badly for loads with an offset.
+        deviations = values - mean
+        return Statistics(
+            count=n,
+            mean=float(mean),
+            std=(float(np.dot(deviations, deviations)) / n) ** 0.5,
+            min_val=float(values.min()),
+            max_val=float(values.max()),
+            rms=(float(np.dot(values, values)) / n) ** 0.5
+        )
+    
     n = len(values)
     mean = sum(values) / n
     
@@ -226,7 +337,11 @@ def get_load_statistics(log: LogFile,
     Returns:
         Statistics in Newtons
     """
-    loads = [raw_to_newtons(adc.raw_adc, calibration) for adc in log.iter_adc()]
+    np = _numpy()
+    if np is not None:
+        loads = _loads_newtons(np, log.adc_columns['raw_adc'], calibration)
+    else:
+        loads = [raw_to_newtons(adc.raw_adc, calibration) for adc in log.iter_adc()]
     return compute_statistics(loads)
 
 
@@ -241,7 +356,11 @@ def get_accel_statistics(log: LogFile, accel_scale: int = 0) -> Statistics:
     Returns:
         Statistics in g
     """
-    accels = [imu.accel_magnitude_g(accel_scale) for imu in log.iter_imu()]
+    np = _numpy()
+    if np is not None:
+        accels = _accel_arrays(np, log.imu_columns, accel_scale)[3]
+    else:
+        accels = [imu.accel_magnitude_g(accel_scale) for imu in log.iter_imu()]
     return compute_statistics(accels)
 
 
@@ -266,71 +385,140 @@ def detect_events(log: LogFile,
     Returns:
         List of event dictionaries with type, start_time, end_time, peak_value
     """
+    np = _numpy()
+    if np is not None:
+        adc = log.adc_columns
+        loads = _loads_newtons(np, adc['raw_adc'], calibration)
+        load_events = _threshold_events(
+            np, loads, np.abs(loads) >= load_threshold_n,
+            adc['timestamp_offset_us'] / 1_000_000, min_duration_s, 'load', 'N')
+        
+        imu = log.imu_columns
+        accels = _accel_arrays(np, imu)[3]
+        accel_events = _threshold_events(
+            np, accels, accels >= accel_threshold_g,
+            imu['timestamp_offset_us'] / 1_000_000, min_duration_s, 'acceleration', 'g')
+        
+        return _sort_events(load_events + accel_events)
+    
     events = []
     
-    # Detect load events
-    in_event = False
-    event_start = 0.0
+    # Walk both streams in one pass, merged by timestamp (ADC first on
+    # ties). Each event is appended when it starts and its end fields are
+    # filled in when it ends; events that are too short or never end are
+    # dropped at the end.
+    adc_iter = log.iter_adc()
+    imu_iter = log.iter_imu()
+    adc = next(adc_iter, None)
+    imu = next(imu_iter, None)
+    
+    load_event = None
     peak_load = 0.0
+    accel_event = None
+    peak_accel = 0.0
     
-    for adc in log.iter_adc():
-        load = raw_to_newtons(adc.raw_adc, calibration)
-        
-        if abs(load) >= load_threshold_n:
-            if not in_event:
-                in_event = True
-                event_start = adc.timestamp_s
-                peak_load = load
-            else:
-                if abs(load) > abs(peak_load):
+    while adc is not None or imu is not None:
+        if imu is None or (adc is not None and
+                           adc.timestamp_offset_us <= imu.timestamp_offset_us):
+            # Load event state machine
+            load = raw_to_newtons(adc.raw_adc, calibration)
+            
+            if abs(load) >= load_threshold_n:
+                if load_event is None:
+                    load_event = {'type': 'load', 'start_time_s': adc.timestamp_s}
+                    events.append(load_event)
                     peak_load = load
-        else:
-            if in_event:
-                duration = adc.timestamp_s - event_start
+                elif abs(load) > abs(peak_load):
+                    peak_load = load
+            elif load_event is not None:
+                duration = adc.timestamp_s - load_event['start_time_s']
                 if duration >= min_duration_s:
-                    events.append({
-                        'type': 'load',
-                        'start_time_s': event_start,
+                    load_event.update({
                         'end_time_s': adc.timestamp_s,
                         'duration_s': duration,
                         'peak_value': peak_load,
                         'unit': 'N'
                     })
-                in_event = False
-    
-    # Detect acceleration events
-    in_event = False
-    event_start = 0.0
-    peak_accel = 0.0
-    
-    for imu in log.iter_imu():
-        accel = imu.accel_magnitude_g()
-        
-        if accel >= accel_threshold_g:
-            if not in_event:
-                in_event = True
-                event_start = imu.timestamp_s
-                peak_accel = accel
-            else:
-                if accel > peak_accel:
-                    peak_accel = accel
+                load_event = None
+            
+            adc = next(adc_iter, None)
         else:
-            if in_event:
-                duration = imu.timestamp_s - event_start
+            # Acceleration event state machine
+            accel = imu.accel_magnitude_g()
+            
+            if accel >= accel_threshold_g:
+                if accel_event is None:
+                    accel_event = {'type': 'acceleration', 'start_time_s': imu.timestamp_s}
+                    events.append(accel_event)
+                    peak_accel = accel
+                elif accel > peak_accel:
+                    peak_accel = accel
+            elif accel_event is not None:
+                duration = imu.timestamp_s - accel_event['start_time_s']
                 if duration >= min_duration_s:
-                    events.append({
-                        'type': 'acceleration',
-                        'start_time_s': event_start,
+                    accel_event.update({
                         'end_time_s': imu.timestamp_s,
                         'duration_s': duration,
                         'peak_value': peak_accel,
                         'unit': 'g'
                     })
-                in_event = False
+                accel_event = None
+            
+            imu = next(imu_iter, None)
+    
+    # Drop events that were too short or still open at the end of the file
+    events = [event for event in events if 'end_time_s' in event]
     
-    # Sort events by start time
-    events.sort(key=lambda e: e['start_time_s'])
+    return _sort_events(events)
+
+
+def _sort_events(events: List[dict]) -> List[dict]:
+    """
+    Order events by start time, load events first on ties.
     
+    Neither the merged pass nor the per-stream arrays give this order by
+    themselves once timestamps go backwards (the uint32 microsecond offset
+    wraps after ~71.6 minutes).
+    """
+    events.sort(key=lambda e: (e['start_time_s'], e['type'] != 'load'))
     return events
 
 
+def _threshold_events(np, values, above, times, min_duration_s: float,
+                      event_type: str, unit: str) -> List[dict]:
+    """
+    Events from a threshold mask, matching detect_events' state machines.
+    
+    An event is a run of samples at or above threshold that is ended by a
+    sample below it (runs still open at the end are dropped); its peak is
+    the first value with the largest magnitude.
+    
+    Args:
+        values: Sample values (signed for load)
+        above: Boolean mask of samples at or above threshold
+        times: Sample timestamps in seconds
+    """
+    edges = np.diff(above.astype(np.int8))
+    starts = np.flatnonzero(edges == 1) + 1
+    if len(above) and above[0]:
+        starts = np.concatenate([[0], starts])
+    ends = np.flatnonzero(edges == -1) + 1
+    starts = starts[:len(ends)]
+    
+    durations = times[ends] - times[starts]
+    keep = np.flatnonzero(durations >= min_duration_s)
+    
+    magnitudes = np.abs(values)
+    events = []
+    for start, end, duration in zip(starts[keep].tolist(), ends[keep].tolist(),
+                                    durations[keep].tolist()):
+        peak = start + int(magnitudes[start:end].argmax())
+        events.append({
+            'type': event_type,
+            'start_time_s': float(times[start]),
+            'end_time_s': float(times[end]),
+            'duration_s': duration,
+            'peak_value': float(values[peak]),
+            'unit': unit
+        })
+    return events
@@ -0,0 +1,178 @@
+"""
+Calibration Module
+
+Piecewise-linear loadcell calibration, matching the firmware's
+CalibrationInterp: raw ADC -> microvolts -> kg by linear interpolation
+between calibration points, extrapolating from the outermost segments.
+
+Polynomial calibration, kg as a polynomial in raw ADC counts.
+
+Any callable raw -> kg can be passed as a calibration. One with a true
+`vectorized` attribute is also called with whole numpy arrays of raw values
+(see calibrate_array()); PiecewiseCalibration and PolynomialCalibration are.
+"""
+
+from bisect import bisect_left
+from numbers import Real
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+
+class PiecewiseCalibration:
+    """
+    Piecewise-linear raw ADC to kg calibration.
+    
+    Instances are callable like any calibration function accepted by the
+    export/analysis helpers (one raw value -> kg). They also accept a numpy
+    array of raw values and convert the whole column in one vectorized pass.
+    
+    Example:
+        cal = PiecewiseCalibration([(0, 0), (1000, 5000), (2000, 10000)])
+        kg = cal(8388)
+        kg_column = cal(log.read_adc_array()['raw_adc'])
+    """
+    
+    # Accepts numpy arrays; see calibrate_array()
+    vectorized = True
+    
+    def __init__(self, points: Sequence[Tuple[float, float]],
+                 vref_mv: float = 2500.0, bits: int = 24, gain: int = 1,
+                 extrapolate: bool = True):
+        """
+        Args:
+            points: (load_kg, output_uV) calibration points (at least 2)
+            vref_mv: ADC reference voltage in mV
+            bits: ADC resolution
+            gain: ADC PGA gain
+            extrapolate: Extrapolate beyond the outermost points
+                        (otherwise clamp to their loads)
+        """
+        if len(points) < 2:
+            raise ValueError(f"At least 2 calibration points required, got {len(points)}")
+        
+        # Sorted by output, as the firmware does
+        ordered = sorted(points, key=lambda p: p[1])
+        self.loads_kg = [float(kg) for kg, _ in ordered]
+        self.outputs_uv = [float(uv) for _, uv in ordered]
+        self.uv_per_lsb = vref_mv * 1000.0 / (1 << (bits - 1)) / gain
+        self.extrapolate = extrapolate
+        
+        # Per-segment line: kg = kg_a + (uV - uV_a) * slope
+        self._slopes = []
+        self._bases = []
+        for i in range(len(ordered) - 1):
+            kg_a, kg_b = self.loads_kg[i], self.loads_kg[i + 1]
+            uv_a, uv_b = self.outputs_uv[i], self.outputs_uv[i + 1]
+            if abs(uv_b - uv_a) < 0.001:
+                # Identical points: firmware returns their mean
+                self._slopes.append(0.0)
+                self._bases.append((kg_a + kg_b) / 2.0)
+            else:
+                self._slopes.append((kg_b - kg_a) / (uv_b - uv_a))
+                self._bases.append(kg_a)
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **kwargs) -> 'PiecewiseCalibration':
+        """
+        Build from a WebUI/firmware config dict.
+        
+        Args:
+            config: Dict with 'calibration_points' as a list of
+                   {'load_kg': ..., 'output_uV': ...}
+            **kwargs: Passed to the constructor (vref_mv, bits, gain, ...)
+        """
+        points = [(p['load_kg'], p['output_uV']) for p in config['calibration_points']]
+        return cls(points, **kwargs)
+    
+    def __call__(self, raw):
+        """Convert raw ADC value(s) to kg"""
+        if isinstance(raw, Real):
+            return self._scalar(raw)
+        return self._vector(raw)
+    
+    def _scalar(self, raw: float) -> float:
+        uv = raw * self.uv_per_lsb
+        if not self.extrapolate:
+            if uv < self.outputs_uv[0]:
+                return self.loads_kg[0]
+            if uv > self.outputs_uv[-1]:
+                return self.loads_kg[-1]
+        # First segment whose upper point is >= uV
+        i = min(max(bisect_left(self.outputs_uv, uv) - 1, 0), len(self._slopes) - 1)
+        return self._bases[i] + (uv - self.outputs_uv[i]) * self._slopes[i]
+    
+    def _vector(self, raw):
+        import numpy as np
+        
+        uv = np.asarray(raw, dtype=np.float64) * self.uv_per_lsb
+        outputs = np.asarray(self.outputs_uv)
+        i = np.clip(np.searchsorted(outputs, uv, side='left') - 1,
+                    0, len(self._slopes) - 1)
+        kg = np.asarray(self._bases)[i] + (uv - outputs[i]) * np.asarray(self._slopes)[i]
+        if not self.extrapolate:
+            kg = np.where(uv < outputs[0], self.loads_kg[0], kg)
+            kg = np.where(uv > outputs[-1], self.loads_kg[-1], kg)
+        return kg
+    
+    def __repr__(self) -> str:
+        return f"PiecewiseCalibration({len(self.loads_kg)} points)"
+
+
+class PolynomialCalibration:
+    """
+    Polynomial raw ADC to kg calibration.
+    
+    Like PiecewiseCalibration, instances take one raw value or a numpy array
+    of raw values (converted in one vectorized pass, no per-sample calls).
+    
+    Example:
+        cal = PolynomialCalibration([1.2e-6, -0.35])   # kg = 1.2e-6 * raw - 0.35
+        kg_column = cal(log.read_adc_array()['raw_adc'])
+    """
+    
+    # Accepts numpy arrays; see calibrate_array()
+    vectorized = True
+    
+    def __init__(self, coefficients: Sequence[float]):
+        """
+        Args:
+            coefficients: Polynomial coefficients in raw ADC counts, highest
+                         power first (as numpy.polyval)
+        """
+        if len(coefficients) < 1:
+            raise ValueError("At least 1 coefficient required")
+        self.coefficients = [float(c) for c in coefficients]
+    
+    def __call__(self, raw):
+        """Convert raw ADC value(s) to kg"""
+        if isinstance(raw, Real):
+            # Horner's rule, as numpy.polyval evaluates it
+            kg = 0.0
+            for c in self.coefficients:
+                kg = kg * raw + c
+            return kg
+        
+        import numpy as np
+        return np.polyval(self.coefficients, np.asarray(raw, dtype=np.float64))
+    
+    def __repr__(self) -> str:
+        return f"PolynomialCalibration({self.coefficients})"
+
+
+def calibrate_array(calibration: Callable, raw):
+    """
+    Apply a calibration to a numpy array of raw ADC values.
+    
+    Args:
+        calibration: Function raw ADC -> kg. If its `vectorized` attribute
+                    is true it is called once with the whole array,
+                    otherwise once per value.
+        raw: numpy array of raw ADC values
+    
+    Returns:
+        float64 numpy array of loads in kg
+    """
+    import numpy as np
+    
+    if getattr(calibration, 'vectorized', False):
+        return np.asarray(calibration(raw), dtype=np.float64)
+    return np.fromiter(map(calibration, raw.tolist()), dtype=np.float64, count=len(raw))
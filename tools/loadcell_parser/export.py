@@ -4,100 +4,368 @@ Data Export Module
 Export log data to various formats: CSV, JSON, and pandas DataFrame.
 """
 
-import csv
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, Iterator, List, Dict, Any, Tuple, Union, TextIO
 from .parser import LogFile
+from .calibration import calibrate_array
 
+# Rows formatted per write() call and per progress_callback invocation
+CSV_CHUNK_ROWS = 100_000
 
-def to_csv(log: LogFile, output_path: str,
+# Rows buffered per write() call when numpy is unavailable
+CSV_BATCH_ROWS = 8192
+
+# Write buffer for CSV output files (the default 8 KiB means one syscall
+# every ~150 rows)
+CSV_BUFFER_SIZE = 1 << 20
+
+# Line terminator of csv.writer's default dialect, which earlier versions
+# wrote with; kept so output stays byte-for-byte the same
+CSV_LINE_TERMINATOR = '\r\n'
+
+# Write buffer for JSON output files
+JSON_BUFFER_SIZE = 1 << 20
+
+# include_data entries formatted per write() call
+JSON_CHUNK_ENTRIES = 65536
+
+# One include_data list entry, laid out as json.dump(..., indent=2) would
+# nest it under the top-level object ('%r' of a float or int is its JSON text)
+JSON_ADC_ENTRY = ('    {\n'
+                  '      "timestamp_s": %r,\n'
+                  '      "raw": %r,\n'
+                  '      "seq": %r\n'
+                  '    }')
+JSON_IMU_ENTRY = ('    {\n'
+                  '      "timestamp_s": %r,\n'
+                  '      "accel": [\n'
+                  '        %r,\n'
+                  '        %r,\n'
+                  '        %r\n'
+                  '      ],\n'
+                  '      "gyro": [\n'
+                  '        %r,\n'
+                  '        %r,\n'
+                  '        %r\n'
+                  '      ]\n'
+                  '    }')
+
+# CSV columns: ADC, calibrated load (with calibration), IMU (with include_imu)
+CSV_ADC_COLUMNS = ('timestamp_s', 'raw_adc', 'sequence_num')
+CSV_LOAD_COLUMNS = ('load_kg', 'load_n')
+CSV_IMU_COLUMNS = ('accel_x_g', 'accel_y_g', 'accel_z_g',
+                   'gyro_x_dps', 'gyro_y_dps', 'gyro_z_dps')
+
+# Header row for each (calibrated, include_imu) combination
+CSV_HEADERS = {
+    (calibrated, include_imu): ','.join(
+        CSV_ADC_COLUMNS
+        + (CSV_LOAD_COLUMNS if calibrated else ())
+        + (CSV_IMU_COLUMNS if include_imu else ())
+    ) + CSV_LINE_TERMINATOR
+    for calibrated in (False, True)
+    for include_imu in (False, True)
+}
+
+
+def to_csv(log: LogFile, output_path: Union[str, TextIO],
            include_imu: bool = True,
            calibration: Optional[Callable[[int], float]] = None,
            accel_scale: int = 0,
-           progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
+           progress_callback: Optional[Callable[[int, int], None]] = None,
+           jobs: int = 1) -> int:
     """
     Export log data to CSV format.
     
     Args:
         log: LogFile instance
-        output_path: Output CSV file path
+        output_path: Output CSV file path, or a text file opened with
+                    newline='' (left open)
         include_imu: Whether to include IMU data columns
         calibration: Optional function to convert raw ADC to kg
         accel_scale: IMU accelerometer scale setting
         progress_callback: Optional callback(current, total) for progress
+        jobs: Worker processes formatting rows (needs numpy; 1 formats
+              in this process)
     
     Returns:
         Number of rows written
     """
-    path = Path(output_path)
+    # Get total count for progress
+    total = log.adc_count
     
-    # Determine columns
-    adc_columns = ['timestamp_s', 'raw_adc', 'sequence_num']
-    if calibration:
-        adc_columns.extend(['load_kg', 'load_n'])
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        numpy = None
     
-    imu_columns = []
-    if include_imu:
-        imu_columns = ['accel_x_g', 'accel_y_g', 'accel_z_g',
-                       'gyro_x_dps', 'gyro_y_dps', 'gyro_z_dps']
+    if hasattr(output_path, 'write'):
+        f = output_path
+    else:
+        f = open(Path(output_path), 'w', newline='', buffering=CSV_BUFFER_SIZE)
     
-    columns = adc_columns + imu_columns
+    try:
+        f.write(CSV_HEADERS[bool(calibration), bool(include_imu)])
+        
+        if numpy is None:
+            return _write_csv_records(f, log, include_imu, calibration,
+                                      accel_scale, progress_callback, total)
+        return _write_csv_arrays(f, log, include_imu, calibration,
+                                 accel_scale, progress_callback, total, jobs)
+    finally:
+        if f is not output_path:
+            f.close()
+
+
+def _write_csv_arrays(f, log: LogFile, include_imu: bool,
+                      calibration: Optional[Callable[[int], float]],
+                      accel_scale: int,
+                      progress_callback: Optional[Callable[[int, int], None]],
+                      total: int, jobs: int = 1) -> int:
+    """Write CSV rows from columnar numpy arrays (fast path for to_csv)"""
+    import numpy as np
     
-    # Get total count for progress
-    total = log.adc_count
+    accel_factor = [0.061, 0.122, 0.244, 0.488][accel_scale] / 1000.0
+    gyro_factor = [4.375, 8.75, 17.5, 35.0, 70.0][accel_scale] / 1000.0
+    placement = _IMUPlacement(np, log.read_imu_array()) if include_imu else None
+    
+    # Stream the file one chunk at a time so only CSV_CHUNK_ROWS rows of
+    # arrays, Python objects and text are alive at once (per job); each
+    # chunk's text goes straight to the file (larger than its buffer, so it
+    # is not copied). With jobs > 1 the text is formatted in worker
+    # processes, at most 2 * jobs chunks ahead of the writer, and written
+    # in order.
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    pending = deque()
+    
+    def write_next():
+        chunk_start, text = pending.popleft()
+        if progress_callback:
+            progress_callback(chunk_start, total)
+        f.write(text if executor is None else text.result())
+        f.write(CSV_LINE_TERMINATOR)
     
+    try:
+        start = 0
+        for chunk in log.iter_adc_arrays(CSV_CHUNK_ROWS):
+            # Calibration runs here: it may be any callable, not
+            # necessarily one that can be sent to a worker process
+            kg = calibrate_array(calibration, chunk['raw_adc']) if calibration else None
+            imu_rows = imu = None
+            if placement is not None:
+                imu_rows, imu = placement.for_rows(start, chunk['timestamp_offset_us'])
+            
+            args = (chunk, kg, imu_rows, imu, accel_factor, gyro_factor)
+            if executor is None:
+                pending.append((start, _csv_chunk_text(*args)))
+            else:
+                pending.append((start, executor.submit(_csv_chunk_text, *args)))
+            if len(pending) > (0 if executor is None else 2 * jobs):
+                write_next()
+            start += len(chunk)
+        
+        while pending:
+            write_next()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    return start
+
+
+def _csv_chunk_text(chunk, kg, imu_rows, imu, accel_factor: float, gyro_factor: float) -> str:
+    """
+    CSV lines for one chunk of ADC records, without the final terminator.
+    
+    Module-level and array-only so it can run in a worker process.
+    
+    Args:
+        chunk: ADC structured array
+        kg: Calibrated loads for the chunk, or None without calibration
+        imu_rows: Row (within the chunk) of each record in imu, or None
+                 without IMU columns
+        imu: IMU structured array placed on imu_rows
+        accel_factor, gyro_factor: Raw IMU value -> g / dps
+    """
+    import numpy as np
+    
+    # Columns become Python scalars in C, then each row is one '%'
+    # operation instead of per-field f-strings + csv.writer
+    seconds, micros = _split_timestamps(np, chunk['timestamp_offset_us'])
+    # sequence_num is signed, as iter_adc() decodes it
+    columns = [seconds, micros, chunk['raw_adc'].tolist(),
+               chunk['sequence_num'].view('<i4').tolist()]
+    if kg is None:
+        row_format = '%d.%06d,%d,%d'.__mod__
+    else:
+        row_format = '%d.%06d,%d,%d,%.6f,%.6f'.__mod__
+        columns.extend([kg.tolist(), (kg * 9.81).tolist()])
+    
+    lines = map(row_format, zip(*columns))
+    if imu_rows is not None:
+        cells = [',,,,,,'] * len(chunk)
+        values = zip(*((imu[name] * accel_factor).tolist()
+                       for name in ('accel_x', 'accel_y', 'accel_z')),
+                     *((imu[name] * gyro_factor).tolist()
+                       for name in ('gyro_x', 'gyro_y', 'gyro_z')))
+        for row, cell in zip(imu_rows.tolist(),
+                             map(',%.4f,%.4f,%.4f,%.2f,%.2f,%.2f'.__mod__, values)):
+            cells[row] = cell
+        lines = map(str.__add__, lines, cells)
+    
+    return CSV_LINE_TERMINATOR.join(lines)
+
+
+def _split_timestamps(np, timestamps_us) -> Tuple[List[int], List[int]]:
+    """
+    Split microsecond timestamps into whole seconds and microseconds.
+    
+    Formatting these as '%d.%06d' is exact and gives the same text as
+    '%.6f' of the float seconds, but skips float-to-decimal conversion.
+    """
+    seconds, micros = np.divmod(timestamps_us, 1_000_000)
+    return seconds.tolist(), micros.tolist()
+
+
+class _IMUPlacement:
+    """
+    Rows that IMU records are written on, worked out one chunk of rows at
+    a time.
+    
+    Each IMU record is written once, on the first ADC row at or after its
+    timestamp that has not already taken an earlier IMU record; all other
+    rows get empty cells.
+    """
+    
+    def __init__(self, np, imu):
+        self.np = np
+        self.imu = imu
+        self.timestamps = imu['timestamp_offset_us']
+        self.next_imu = 0       # First IMU record not yet placed
+        self.next_row = 0       # First row after the last one given an IMU record
+    
+    def for_rows(self, start: int, adc_timestamps):
+        """
+        IMU records placed on rows start .. start + len(adc_timestamps) - 1.
+        
+        Returns:
+            (rows, imu): row of each record relative to start, and the records
+        """
+        np = self.np
+        n = len(adc_timestamps)
+        k0 = self.next_imu
+        none = (np.empty(0, dtype=np.intp), self.imu[k0:k0])
+        if n == 0:
+            return none
+        
+        # The searches below need non-decreasing timestamps; a wrapped
+        # (uint32 microseconds, ~71.6 min) or garbled chunk is placed row by row
+        imu_timestamps = self.timestamps[k0:k0 + n]
+        if not (np.all(adc_timestamps[1:] >= adc_timestamps[:-1])
+                and np.all(imu_timestamps[1:] >= imu_timestamps[:-1])):
+            return self._for_rows_sequential(start, adc_timestamps)
+        
+        # Candidates: records timestamped within this chunk (at most one per row)
+        k1 = k0 + int(np.searchsorted(imu_timestamps, adc_timestamps[-1], side='right'))
+        if k1 == k0:
+            return none
+        
+        # First eligible row per IMU record, pushed forward so that no two
+        # IMU records share a row
+        first_row = start + np.searchsorted(adc_timestamps, self.timestamps[k0:k1],
+                                            side='left')
+        k = np.arange(k0, k1)
+        rows = k + np.maximum.accumulate(np.maximum(first_row - k, self.next_row - k0))
+        placed = int(np.searchsorted(rows, start + n, side='left'))
+        if placed == 0:
+            return none
+        
+        self.next_imu = k0 + placed
+        self.next_row = int(rows[placed - 1]) + 1
+        return rows[:placed] - start, self.imu[k0:k0 + placed]
+    
+    def _for_rows_sequential(self, start: int, adc_timestamps):
+        """for_rows() for any timestamps: the record-by-record writer's rule"""
+        np = self.np
+        k0 = k = self.next_imu
+        imu_timestamps = self.timestamps[k0:k0 + len(adc_timestamps)].tolist()
+        rows = []
+        for row, timestamp in enumerate(adc_timestamps.tolist()):
+            if k - k0 < len(imu_timestamps) and imu_timestamps[k - k0] <= timestamp:
+                rows.append(row)
+                k += 1
+        
+        if rows:
+            self.next_imu = k
+            self.next_row = start + rows[-1] + 1
+        return np.array(rows, dtype=np.intp), self.imu[k0:k]
+
+
+def _write_csv_records(f, log: LogFile, include_imu: bool,
+                       calibration: Optional[Callable[[int], float]],
+                       accel_scale: int,
+                       progress_callback: Optional[Callable[[int, int], None]],
+                       total: int) -> int:
+    """Write CSV rows record by record (used when numpy is unavailable)"""
     rows_written = 0
+    lines = []
     
-    with open(path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(columns)
+    # Each row is built from precompiled '%' templates (one C-level format
+    # per column group instead of an f-string per field plus csv.writer)
+    adc_format = '%.6f,%d,%d'.__mod__
+    load_format = ',%.6f,%.6f'.__mod__
+    imu_format = ',%.4f,%.4f,%.4f,%.2f,%.2f,%.2f'.__mod__
+    
+    # Create iterators
+    adc_iter = log.iter_adc()
+    imu_iter = iter(log.iter_imu()) if include_imu else iter([])
+    
+    current_imu = None
+    if include_imu:
+        try:
+            current_imu = next(imu_iter)
+        except StopIteration:
+            current_imu = None
+    
+    for i, adc in enumerate(adc_iter):
+        timestamp_s = adc.timestamp_s
+        line = adc_format((timestamp_s, adc.raw_adc, adc.sequence_num))
         
-        # Create iterators
-        adc_iter = log.iter_adc()
-        imu_iter = iter(log.iter_imu()) if include_imu else iter([])
+        if calibration:
+            kg = calibration(adc.raw_adc)
+            line += load_format((kg, kg * 9.81))
         
-        current_imu = None
+        # Add IMU data (interpolated to closest timestamp)
         if include_imu:
-            try:
-                current_imu = next(imu_iter)
-            except StopIteration:
-                current_imu = None
+            if current_imu and current_imu.timestamp_s <= timestamp_s:
+                line += imu_format(current_imu.accel_g(accel_scale)
+                                   + current_imu.gyro_dps(accel_scale))
+                try:
+                    current_imu = next(imu_iter)
+                except StopIteration:
+                    current_imu = None
+            else:
+                line += ',,,,,,'
         
-        for i, adc in enumerate(adc_iter):
-            row = [
-                f"{adc.timestamp_s:.6f}",
-                adc.raw_adc,
-                adc.sequence_num
-            ]
-            
-            if calibration:
-                kg = calibration(adc.raw_adc)
-                row.extend([f"{kg:.6f}", f"{kg * 9.81:.6f}"])
-            
-            # Add IMU data (interpolated to closest timestamp)
-            if include_imu:
-                if current_imu and current_imu.timestamp_s <= adc.timestamp_s:
-                    ax, ay, az = current_imu.accel_g(accel_scale)
-                    gx, gy, gz = current_imu.gyro_dps(accel_scale)
-                    row.extend([
-                        f"{ax:.4f}", f"{ay:.4f}", f"{az:.4f}",
-                        f"{gx:.2f}", f"{gy:.2f}", f"{gz:.2f}"
-                    ])
-                    try:
-                        current_imu = next(imu_iter)
-                    except StopIteration:
-                        current_imu = None
-                else:
-                    row.extend(['', '', '', '', '', ''])
-            
-            writer.writerow(row)
-            rows_written += 1
-            
-            if progress_callback and i % 10000 == 0:
-                progress_callback(i, total)
+        # One write() per batch of rows
+        lines.append(line)
+        if len(lines) == CSV_BATCH_ROWS:
+            f.write(CSV_LINE_TERMINATOR.join(lines))
+            f.write(CSV_LINE_TERMINATOR)
+            rows_written += len(lines)
+            lines.clear()
+        
+        if progress_callback and i % 10000 == 0:
+            progress_callback(i, total)
     
-    return rows_written
+    if lines:
+        f.write(CSV_LINE_TERMINATOR.join(lines))
+        f.write(CSV_LINE_TERMINATOR)
+    return rows_written + len(lines)
 
 
 def to_json(log: LogFile, output_path: str,
@@ -112,7 +380,8 @@ def to_json(log: LogFile, output_path: str,
         include_data: Whether to include all sample data (can be large!)
         calibration: Optional function to convert raw ADC to kg
     """
-    from .analysis import find_peaks, find_accel_peaks, get_load_statistics
+    from .analysis import (find_peaks, find_accel_peaks, get_load_statistics,
+                           compute_statistics, _numpy, _loads_newtons, _load_peaks)
     
     result = {
         'file': {
@@ -145,8 +414,18 @@ def to_json(log: LogFile, output_path: str,
             'crc32': f"0x{log.footer.crc32:08X}",
         }
     
-    # Add peak analysis
-    load_peaks = find_peaks(log, calibration=calibration)
+    # Add peak analysis. With numpy, loads are computed once for both the
+    # peaks and the statistics, and the per-sample peak list (every sample
+    # at the default threshold) is skipped since it isn't exported.
+    np = _numpy()
+    if np is not None:
+        adc = log.adc_columns
+        loads = _loads_newtons(np, adc['raw_adc'], calibration)
+        load_peaks = _load_peaks(np, adc, loads, None)
+        stats = compute_statistics(loads)
+    else:
+        load_peaks = find_peaks(log, calibration=calibration)
+        stats = get_load_statistics(log, calibration)
     accel_peaks = find_accel_peaks(log)
     
     result['peaks'] = {
@@ -159,35 +438,92 @@ def to_json(log: LogFile, output_path: str,
     }
     
     # Add statistics
-    stats = get_load_statistics(log, calibration)
     result['statistics'] = {
         'load_mean_n': stats.mean,
         'load_std_n': stats.std,
         'load_rms_n': stats.rms,
     }
     
-    # Optionally include all data
-    if include_data:
-        result['adc_data'] = [
-            {
-                'timestamp_s': adc.timestamp_s,
-                'raw': adc.raw_adc,
-                'seq': adc.sequence_num
-            }
-            for adc in log.iter_adc()
-        ]
+    with open(output_path, 'w', buffering=JSON_BUFFER_SIZE) as f:
+        if not include_data:
+            json.dump(result, f, indent=2)
+            return
         
-        result['imu_data'] = [
-            {
-                'timestamp_s': imu.timestamp_s,
-                'accel': list(imu.accel_g()),
-                'gyro': list(imu.gyro_dps())
-            }
-            for imu in log.iter_imu()
-        ]
+        # Sample data is streamed record by record after the rest of the
+        # object, so neither the lists of dicts nor the encoded text of the
+        # whole file are held in memory. The output is the same as
+        # json.dump(..., indent=2) of the full dict.
+        f.write(json.dumps(result, indent=2)[:-2])  # drop the closing '\n}'
+        f.write(',\n  "adc_data": ')
+        _write_json_entries(f, _json_adc_entries(log))
+        f.write(',\n  "imu_data": ')
+        _write_json_entries(f, _json_imu_entries(log))
+        f.write('\n}')
+
+
+def _write_json_entries(f, chunks: Iterator[List[str]]) -> None:
+    """Write chunks of pre-formatted entries as a JSON list nested in the top-level object"""
+    first = True
+    for entries in chunks:
+        if entries:
+            f.write('[\n' if first else ',\n')
+            f.write(',\n'.join(entries))
+            first = False
+    f.write('[]' if first else '\n  ]')
+
+
+def _json_adc_entries(log: LogFile) -> Iterator[List[str]]:
+    """include_data ADC entries, in chunks (formatted from array columns with numpy)"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        entries = (JSON_ADC_ENTRY % (adc.timestamp_s, adc.raw_adc, adc.sequence_num)
+                   for adc in log.iter_adc())
+        yield from _batches(entries, JSON_CHUNK_ENTRIES)
+        return
+    
+    # sequence_num is signed, as iter_adc() decodes it
+    for chunk in log.iter_adc_arrays(JSON_CHUNK_ENTRIES):
+        yield list(map(JSON_ADC_ENTRY.__mod__, zip(
+            (chunk['timestamp_offset_us'] / 1_000_000).tolist(),
+            chunk['raw_adc'].tolist(),
+            chunk['sequence_num'].view('<i4').tolist(),
+        )))
+
+
+def _json_imu_entries(log: LogFile) -> Iterator[List[str]]:
+    """include_data IMU entries, in chunks (formatted from array columns with numpy)"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        entries = (JSON_IMU_ENTRY % (imu.timestamp_s, *imu.accel_g(), *imu.gyro_dps())
+                   for imu in log.iter_imu())
+        yield from _batches(entries, JSON_CHUNK_ENTRIES)
+        return
     
-    with open(output_path, 'w') as f:
-        json.dump(result, f, indent=2)
+    # Default scales, as IMURecord.accel_g()/gyro_dps()
+    accel_factor = 0.061 / 1000.0
+    gyro_factor = 4.375 / 1000.0
+    imu = log.read_imu_array()
+    for i in range(0, len(imu), JSON_CHUNK_ENTRIES):
+        chunk = imu[i:i + JSON_CHUNK_ENTRIES]
+        yield list(map(JSON_IMU_ENTRY.__mod__, zip(
+            (chunk['timestamp_offset_us'] / 1_000_000).tolist(),
+            *((chunk[name] * accel_factor).tolist()
+              for name in ('accel_x', 'accel_y', 'accel_z')),
+            *((chunk[name] * gyro_factor).tolist()
+              for name in ('gyro_x', 'gyro_y', 'gyro_z')),
+        )))
+
+
+def _batches(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    """Lists of up to size consecutive items"""
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
 
 
 def to_dataframe(log: LogFile,
@@ -216,35 +552,36 @@ def to_dataframe(log: LogFile,
                         "Install with: pip install pandas")
     
     if data_type == 'adc':
-        data = []
-        for adc in log.iter_adc():
-            row = {
-                'timestamp_s': adc.timestamp_s,
-                'raw_adc': adc.raw_adc,
-                'sequence_num': adc.sequence_num,
-            }
-            if calibration:
-                kg = calibration(adc.raw_adc)
-                row['load_kg'] = kg
-                row['load_n'] = kg * 9.81
-            data.append(row)
-        return pd.DataFrame(data)
+        # Column arrays straight from the bulk ADC array. Integer columns
+        # stay int64 (with sequence_num signed, as iter_adc() decodes it),
+        # matching the frames previously built from per-record dicts.
+        import numpy as np
+        
+        adc = log.read_adc_array()
+        columns = {
+            'timestamp_s': adc['timestamp_offset_us'] / 1_000_000,
+            'raw_adc': adc['raw_adc'].astype(np.int64),
+            'sequence_num': adc['sequence_num'].view('<i4').astype(np.int64),
+        }
+        if calibration:
+            columns['load_kg'] = calibrate_array(calibration, adc['raw_adc'])
+            columns['load_n'] = columns['load_kg'] * 9.81
+        return pd.DataFrame(columns)
     
     elif data_type == 'imu':
-        data = []
-        for imu in log.iter_imu():
-            ax, ay, az = imu.accel_g(accel_scale)
-            gx, gy, gz = imu.gyro_dps(accel_scale)
-            data.append({
-                'timestamp_s': imu.timestamp_s,
-                'accel_x_g': ax,
-                'accel_y_g': ay,
-                'accel_z_g': az,
-                'gyro_x_dps': gx,
-                'gyro_y_dps': gy,
-                'gyro_z_dps': gz,
-            })
-        return pd.DataFrame(data)
+        # Whole-column scaling, as IMURecord.accel_g()/gyro_dps()
+        imu = log.read_imu_array()
+        accel_factor = [0.061, 0.122, 0.244, 0.488][accel_scale] / 1000.0
+        gyro_factor = [4.375, 8.75, 17.5, 35.0, 70.0][accel_scale] / 1000.0
+        return pd.DataFrame({
+            'timestamp_s': imu['timestamp_offset_us'] / 1_000_000,
+            'accel_x_g': imu['accel_x'] * accel_factor,
+            'accel_y_g': imu['accel_y'] * accel_factor,
+            'accel_z_g': imu['accel_z'] * accel_factor,
+            'gyro_x_dps': imu['gyro_x'] * gyro_factor,
+            'gyro_y_dps': imu['gyro_y'] * gyro_factor,
+            'gyro_z_dps': imu['gyro_z'] * gyro_factor,
+        })
     
     elif data_type == 'merged':
         # Create both dataframes and merge on timestamp
@@ -287,28 +624,25 @@ def to_numpy(log: LogFile,
                         "Install with: pip install numpy")
     
     if data_type == 'adc':
-        records = list(log.iter_adc())
+        # Columns are sliced from one bulk-decoded structured array
+        adc = log.read_adc_array()
+        raw = adc['raw_adc'].astype(np.int32)
         result = {
-            'timestamp_s': np.array([r.timestamp_s for r in records]),
-            'raw_adc': np.array([r.raw_adc for r in records], dtype=np.int32),
-            'sequence_num': np.array([r.sequence_num for r in records], dtype=np.uint32),
+            'timestamp_s': adc['timestamp_offset_us'] / 1_000_000,
+            'raw_adc': raw,
+            'sequence_num': adc['sequence_num'].astype(np.uint32),
         }
         if calibration:
-            result['load_kg'] = np.array([calibration(r.raw_adc) for r in records])
+            result['load_kg'] = calibrate_array(calibration, raw)
             result['load_n'] = result['load_kg'] * 9.81
         return result
     
     elif data_type == 'imu':
-        records = list(log.iter_imu())
-        return {
-            'timestamp_s': np.array([r.timestamp_s for r in records]),
-            'accel_x': np.array([r.accel_x for r in records], dtype=np.int16),
-            'accel_y': np.array([r.accel_y for r in records], dtype=np.int16),
-            'accel_z': np.array([r.accel_z for r in records], dtype=np.int16),
-            'gyro_x': np.array([r.gyro_x for r in records], dtype=np.int16),
-            'gyro_y': np.array([r.gyro_y for r in records], dtype=np.int16),
-            'gyro_z': np.array([r.gyro_z for r in records], dtype=np.int16),
-        }
+        imu = log.read_imu_array()
+        result = {'timestamp_s': imu['timestamp_offset_us'] / 1_000_000}
+        for name in ('accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z'):
+            result[name] = imu[name].astype(np.int16)
+        return result
     
     else:
         raise ValueError(f"Unknown data_type: {data_type}")
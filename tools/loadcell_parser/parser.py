@@ -5,9 +5,11 @@ Parses binary log files from the ESP32-S3 Loadcell Datalogger.
 Supports lazy loading for memory-efficient processing of large files.
 """
 
+import mmap
 import struct
 from dataclasses import dataclass
-from typing import Iterator, Optional, BinaryIO, List, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, BinaryIO, List, Tuple
 from pathlib import Path
 from datetime import datetime
 
@@ -20,10 +22,67 @@ HEADER_SIZE = 64
 ADC_RECORD_SIZE = 12
 IMU_RECORD_SIZE = 16
 
+# Precompiled on-disk layouts (one unpack call per header/record/footer)
+_HEADER_STRUCT = struct.Struct('<IHHIIQ32sBBBBB3x')
+_ADC_STRUCT = struct.Struct('<Iii')
+_IMU_STRUCT = struct.Struct('<Ihhhhhh')
+_FOOTER_STRUCT = struct.Struct('<IQQIII')
+
+# numpy structured dtypes matching the on-disk record layouts
+ADC_RECORD_DTYPE = [
+    ('timestamp_offset_us', '<u4'),
+    ('raw_adc', '<i4'),
+    ('sequence_num', '<u4'),
+]
+IMU_RECORD_DTYPE = [
+    ('timestamp_offset_us', '<u4'),
+    ('accel_x', '<i2'),
+    ('accel_y', '<i2'),
+    ('accel_z', '<i2'),
+    ('gyro_x', '<i2'),
+    ('gyro_y', '<i2'),
+    ('gyro_z', '<i2'),
+]
+
+# Event code -> EventRecord.event_name (read-only)
+_EVENT_NAMES = MappingProxyType({
+    0x0001: 'SessionStart',
+    0x0002: 'SessionEnd',
+    0x0010: 'ButtonPress',
+    0x0020: 'Overflow',
+    0x0030: 'SyncLost',
+    0x0031: 'SyncRestored',
+    0x0100: 'CalibrationPoint',
+    0x00F0: 'Checkpoint',
+    0x00F1: 'FileRotation',
+    0x00F2: 'LowBattery',
+    0x00F3: 'Saturation',
+    0x00F4: 'WriteLatency',
+    0x00F5: 'Recovery',
+})
+
+# Records decoded per step when scanning or streaming ADC arrays
+ADC_CHUNK_RECORDS = 65536
+
+
+def _check_numpy():
+    """Check if numpy is available"""
+    try:
+        import numpy as np
+        return np
+    except ImportError:
+        raise ImportError("numpy is required for array access. "
+                        "Install with: pip install numpy")
+
 
 @dataclass
 class FileHeader:
     """Log file header (64 bytes)"""
+    __slots__ = ('magic', 'version', 'header_size', 'adc_sample_rate_hz',
+                 'imu_sample_rate_hz', 'start_timestamp_us', 'loadcell_id',
+                 'flags', 'adc_gain', 'adc_bits', 'imu_accel_scale',
+                 'imu_gyro_scale')
+    
     magic: int
     version: int
     header_size: int
@@ -55,21 +114,17 @@ class FileHeader:
         if len(data) < HEADER_SIZE:
             raise ValueError(f"Header too short: {len(data)} < {HEADER_SIZE}")
         
-        magic, version, header_size = struct.unpack_from('<IHH', data, 0)
-        adc_rate, imu_rate = struct.unpack_from('<II', data, 8)
-        start_ts = struct.unpack_from('<Q', data, 16)[0]
+        (magic, version, header_size, adc_rate, imu_rate, start_ts, loadcell_bytes,
+         flags, adc_gain, adc_bits, imu_accel_scale, imu_gyro_scale) = \
+            _HEADER_STRUCT.unpack_from(data, 0)
         
         # Extract null-terminated string
-        loadcell_bytes = data[24:56]
         null_pos = loadcell_bytes.find(b'\x00')
         if null_pos >= 0:
             loadcell_id = loadcell_bytes[:null_pos].decode('utf-8', errors='replace')
         else:
             loadcell_id = loadcell_bytes.decode('utf-8', errors='replace')
         
-        flags, adc_gain, adc_bits = struct.unpack_from('<BBB', data, 56)
-        imu_accel_scale, imu_gyro_scale = struct.unpack_from('<BB', data, 59)
-        
         return cls(
             magic=magic,
             version=version,
@@ -89,6 +144,9 @@ class FileHeader:
 @dataclass
 class ADCRecord:
     """ADC sample record (12 bytes)"""
+    # One instance per sample, so no per-instance __dict__
+    __slots__ = ('timestamp_offset_us', 'raw_adc', 'sequence_num')
+    
     timestamp_offset_us: int
     raw_adc: int
     sequence_num: int
@@ -109,13 +167,17 @@ class ADCRecord:
         if len(data) < ADC_RECORD_SIZE:
             raise ValueError(f"ADC record too short: {len(data)} < {ADC_RECORD_SIZE}")
         
-        ts, raw, seq = struct.unpack_from('<Iii', data, 0)
+        ts, raw, seq = _ADC_STRUCT.unpack_from(data, 0)
         return cls(timestamp_offset_us=ts, raw_adc=raw, sequence_num=seq)
 
 
 @dataclass  
 class IMURecord:
     """IMU sample record (16 bytes)"""
+    # One instance per sample, so no per-instance __dict__
+    __slots__ = ('timestamp_offset_us', 'accel_x', 'accel_y', 'accel_z',
+                 'gyro_x', 'gyro_y', 'gyro_z')
+    
     timestamp_offset_us: int
     accel_x: int
     accel_y: int
@@ -154,9 +216,7 @@ class IMURecord:
         if len(data) < IMU_RECORD_SIZE:
             raise ValueError(f"IMU record too short: {len(data)} < {IMU_RECORD_SIZE}")
         
-        ts = struct.unpack_from('<I', data, 0)[0]
-        ax, ay, az = struct.unpack_from('<hhh', data, 4)
-        gx, gy, gz = struct.unpack_from('<hhh', data, 10)
+        ts, ax, ay, az, gx, gy, gz = _IMU_STRUCT.unpack_from(data, 0)
         return cls(
             timestamp_offset_us=ts,
             accel_x=ax, accel_y=ay, accel_z=az,
@@ -167,6 +227,8 @@ class IMURecord:
 @dataclass
 class EventRecord:
     """Event marker record (8+ bytes)"""
+    __slots__ = ('timestamp_offset_us', 'event_code', 'data')
+    
     timestamp_offset_us: int
     event_code: int
     data: bytes
@@ -179,27 +241,15 @@ class EventRecord:
     @property
     def event_name(self) -> str:
         """Human-readable event name"""
-        names = {
-            0x0001: 'SessionStart',
-            0x0002: 'SessionEnd',
-            0x0010: 'ButtonPress',
-            0x0020: 'Overflow',
-            0x0030: 'SyncLost',
-            0x0031: 'SyncRestored',
-            0x0100: 'CalibrationPoint',
-            0x00F0: 'Checkpoint',
-            0x00F1: 'FileRotation',
-            0x00F2: 'LowBattery',
-            0x00F3: 'Saturation',
-            0x00F4: 'WriteLatency',
-            0x00F5: 'Recovery',
-        }
-        return names.get(self.event_code, f'Unknown(0x{self.event_code:04X})')
+        return _EVENT_NAMES.get(self.event_code, f'Unknown(0x{self.event_code:04X})')
 
 
 @dataclass
 class FileFooter:
     """File footer for integrity verification (32 bytes)"""
+    __slots__ = ('magic', 'total_adc_samples', 'total_imu_samples',
+                 'dropped_samples', 'end_timestamp_us', 'crc32')
+    
     magic: int
     total_adc_samples: int
     total_imu_samples: int
@@ -223,16 +273,10 @@ class FileFooter:
         if len(data) < 32:
             return None
         
-        magic = struct.unpack_from('<I', data, 0)[0]
+        magic, total_adc, total_imu, dropped, end_ts, crc = _FOOTER_STRUCT.unpack_from(data, 0)
         if magic != FOOTER_MAGIC:
             return None
         
-        total_adc = struct.unpack_from('<Q', data, 4)[0]
-        total_imu = struct.unpack_from('<Q', data, 12)[0]
-        dropped = struct.unpack_from('<I', data, 20)[0]
-        end_ts = struct.unpack_from('<I', data, 24)[0]
-        crc = struct.unpack_from('<I', data, 28)[0]
-        
         return cls(
             magic=magic,
             total_adc_samples=total_adc,
@@ -248,11 +292,13 @@ class LogFile:
     Loadcell datalogger binary file parser.
     
     Supports lazy loading for memory-efficient processing of large files.
+    The file is memory-mapped once on open and every read goes through that
+    mapping; use close() (or a with block) to release it early.
     
     Example:
-        log = LogFile('data.bin')
-        for adc in log.iter_adc():
-            print(f"{adc.timestamp_s:.6f}: {adc.raw_adc}")
+        with LogFile('data.bin') as log:
+            for adc in log.iter_adc():
+                print(f"{adc.timestamp_s:.6f}: {adc.raw_adc}")
     """
     
     def __init__(self, filepath: str):
@@ -262,16 +308,46 @@ class LogFile:
         self._adc_records: Optional[List[ADCRecord]] = None
         self._imu_records: Optional[List[IMURecord]] = None
         self._events: Optional[List[EventRecord]] = None
+        self._record_counts: Optional[Tuple[int, int]] = None
+        self._adc_columns: Optional[Dict[str, Any]] = None
+        self._imu_columns: Optional[Dict[str, Any]] = None
         
-        # Parse header on init
+        # Parse header on init, then map the (at least header-sized) file
         with open(self.filepath, 'rb') as f:
             header_data = f.read(HEADER_SIZE)
             self._header = FileHeader.from_bytes(header_data)
-            
-            # Try to read footer from end
-            f.seek(-32, 2)  # Seek 32 bytes from end
-            footer_data = f.read(32)
-            self._footer = FileFooter.from_bytes(footer_data)
+            self._mm: Optional[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+        
+        # Try to read footer from end
+        self._footer = FileFooter.from_bytes(self._mm[-32:])
+    
+    def close(self) -> None:
+        """
+        Release the file mapping. Arrays from read_adc_array() and friends
+        are views into it; if any are still alive, the mapping is released
+        once they are garbage collected instead.
+        """
+        self._adc_columns = self._imu_columns = None
+        mm, self._mm = self._mm, None
+        if mm is not None:
+            try:
+                mm.close()
+            except BufferError:
+                pass
+    
+    def __enter__(self) -> 'LogFile':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _mapping(self) -> mmap.mmap:
+        """The file mapping (ValueError if closed)"""
+        if self._mm is None:
+            raise ValueError(f"I/O operation on closed log file: {self.filepath}")
+        return self._mm
     
     @property
     def header(self) -> FileHeader:
@@ -298,14 +374,14 @@ class LogFile:
         """Number of ADC samples (from footer or counted)"""
         if self._footer:
             return self._footer.total_adc_samples
-        return len(self.adc_records)
+        return self._count_records()[0]
     
     @property
     def imu_count(self) -> int:
         """Number of IMU samples (from footer or counted)"""
         if self._footer:
             return self._footer.total_imu_samples
-        return len(self.imu_records)
+        return self._count_records()[1]
     
     @property
     def duration_seconds(self) -> float:
@@ -313,9 +389,9 @@ class LogFile:
         if self._footer:
             return self._footer.duration_s
         # Estimate from last record
-        adc = self.adc_records
-        if adc:
-            return adc[-1].timestamp_s
+        n_adc = self._count_records()[0]
+        if n_adc:
+            return ADCRecord.from_bytes(self._mapping()[self._adc_offset(n_adc - 1):]).timestamp_s
         return 0.0
     
     @property
@@ -339,63 +415,264 @@ class LogFile:
             self._imu_records = list(self.iter_imu())
         return self._imu_records
     
-    def iter_adc(self) -> Iterator[ADCRecord]:
-        """Iterate ADC records without loading all into memory"""
-        with open(self.filepath, 'rb') as f:
-            f.seek(HEADER_SIZE)
+    @property
+    def adc_columns(self) -> Dict[str, Any]:
+        """
+        ADC record fields (names as in ADC_RECORD_DTYPE) as contiguous,
+        read-only numpy arrays. Decoded on first access and cached, so
+        repeated analysis calls on the same log share one decode.
+        
+        Raises:
+            ImportError if numpy is not installed
+        """
+        if self._adc_columns is None:
+            self._adc_columns = self._columns(self.read_adc_array())
+        return self._adc_columns
+    
+    @property
+    def imu_columns(self) -> Dict[str, Any]:
+        """
+        IMU record fields (names as in IMU_RECORD_DTYPE) as contiguous,
+        read-only numpy arrays, cached like adc_columns.
+        
+        Raises:
+            ImportError if numpy is not installed
+        """
+        if self._imu_columns is None:
+            self._imu_columns = self._columns(self.read_imu_array())
+        return self._imu_columns
+    
+    @staticmethod
+    def _columns(records) -> Dict[str, Any]:
+        """Structured array -> dict of contiguous read-only field arrays"""
+        np = _check_numpy()
+        columns = {}
+        for name in records.dtype.names:
+            column = np.ascontiguousarray(records[name])
+            column.flags.writeable = False
+            columns[name] = column
+        return columns
+    
+    @property
+    def imu_decimation(self) -> int:
+        """Number of ADC records between interleaved IMU records (0 if no IMU)"""
+        if self._header.imu_sample_rate_hz > 0:
+            return self._header.adc_sample_rate_hz // self._header.imu_sample_rate_hz
+        return 0
+    
+    def _block_size(self) -> int:
+        """Bytes per interleave block (one IMU record and the ADC records before it)"""
+        imu_decimation = self.imu_decimation
+        if imu_decimation == 0:
+            return ADC_RECORD_SIZE
+        return imu_decimation * ADC_RECORD_SIZE + IMU_RECORD_SIZE
+    
+    def _adc_offset(self, index: int) -> int:
+        """File offset of ADC record index"""
+        per_block = max(self.imu_decimation, 1)
+        block, slot = divmod(index, per_block)
+        return HEADER_SIZE + block * self._block_size() + slot * ADC_RECORD_SIZE
+    
+    def _count_records(self) -> Tuple[int, int]:
+        """
+        (ADC, IMU) record counts, as iter_adc()/iter_imu() would yield.
+        
+        Computed from the file size and record offsets; only the first byte
+        of each ADC slot is read (to find the end record), and no records
+        are decoded.
+        """
+        if self._record_counts is None:
+            imu_decimation = self.imu_decimation
+            block_size = self._block_size()
+            mm = self._mapping()
+            size = len(mm)
             
-            # Calculate expected IMU decimation
-            imu_decimation = (self._header.adc_sample_rate_hz // 
-                            self._header.imu_sample_rate_hz) if self._header.imu_sample_rate_hz > 0 else 0
+            # Slot j's first bytes across all blocks, in one strided slice
+            n_adc = 0
+            end = None
+            for slot in range(max(imu_decimation, 1)):
+                first_bytes = mm[HEADER_SIZE + slot * ADC_RECORD_SIZE:
+                                 size - ADC_RECORD_SIZE + 1:block_size]
+                n_adc += len(first_bytes)
+                block = first_bytes.find(0xFF)
+                if block >= 0:
+                    index = block * max(imu_decimation, 1) + slot
+                    end = index if end is None else min(end, index)
             
-            sample_count = 0
-            while True:
-                data = f.read(ADC_RECORD_SIZE)
-                if len(data) < ADC_RECORD_SIZE:
-                    break
-                
+            if end is not None:
+                n_adc = end
+            n_imu = 0
+            if imu_decimation > 0:
+                n_imu = min(n_adc // imu_decimation, (size - HEADER_SIZE) // block_size)
+            self._record_counts = (n_adc, n_imu)
+        return self._record_counts
+    
+    def read_adc_array(self):
+        """
+        All ADC records as a numpy structured array (ADC_RECORD_DTYPE).
+        
+        Decodes the record stream in bulk instead of one ADCRecord per sample.
+        
+        Raises:
+            ImportError if numpy is not installed
+        """
+        return self._read_arrays()[0]
+    
+    def iter_adc_arrays(self, chunk_size: int = ADC_CHUNK_RECORDS):
+        """
+        Iterate ADC records as numpy structured arrays of up to chunk_size
+        records (rounded down to whole IMU blocks).
+        
+        Only one chunk is decoded at a time, so memory use stays flat
+        regardless of file size.
+        
+        Raises:
+            ImportError if numpy is not installed
+        """
+        np = _check_numpy()
+        adc_blocks, tail_adc, _ = self._map_records(np)
+        remaining = self._adc_length(np, adc_blocks, tail_adc)
+        
+        step = max(1, chunk_size // adc_blocks.shape[1])
+        for i in range(0, len(adc_blocks), step):
+            if remaining <= 0:
+                return
+            chunk = adc_blocks[i:i + step].reshape(-1)[:remaining]
+            remaining -= len(chunk)
+            yield chunk
+        
+        if remaining > 0:
+            yield tail_adc[:remaining]
+    
+    def _read_arrays(self):
+        """Decode the interleaved ADC/IMU stream into (adc, imu) arrays"""
+        np = _check_numpy()
+        adc_blocks, tail_adc, imu = self._map_records(np)
+        n_adc = self._adc_length(np, adc_blocks, tail_adc)
+        
+        if len(tail_adc):
+            adc = np.concatenate([adc_blocks.reshape(-1), tail_adc])
+        else:
+            adc = adc_blocks.reshape(-1)
+        
+        imu_decimation = self.imu_decimation
+        if imu_decimation > 0:
+            imu = imu[:n_adc // imu_decimation]
+        
+        return adc[:n_adc], imu
+    
+    def read_imu_array(self):
+        """
+        All IMU records as a numpy structured array (IMU_RECORD_DTYPE).
+        
+        Raises:
+            ImportError if numpy is not installed
+        """
+        np = _check_numpy()
+        adc_blocks, tail_adc, imu = self._map_records(np)
+        imu_decimation = self.imu_decimation
+        if imu_decimation > 0:
+            imu = imu[:self._adc_length(np, adc_blocks, tail_adc) // imu_decimation]
+        return imu
+    
+    def _map_records(self, np):
+        """
+        Map the record stream as numpy views into the file.
+        
+        Returns:
+            (adc_blocks, tail_adc, imu): adc_blocks is 2-D with one row of
+            imu_decimation ADC records per interleaved IMU record (a single
+            column if there is no IMU data), tail_adc holds the ADC records
+            after the last complete block. Nothing is truncated at the end
+            record; see _adc_length().
+        """
+        adc_dtype = np.dtype(ADC_RECORD_DTYPE)
+        imu_dtype = np.dtype(IMU_RECORD_DTYPE)
+        
+        # Arrays index straight into the file mapping (and keep it alive for
+        # as long as they exist)
+        data = memoryview(self._mapping())[HEADER_SIZE:]
+        
+        imu_decimation = self.imu_decimation
+        if imu_decimation == 0:
+            adc = np.frombuffer(data, dtype=adc_dtype,
+                                count=len(data) // ADC_RECORD_SIZE)
+            return adc.reshape(-1, 1), adc[:0], np.empty(0, dtype=imu_dtype)
+        
+        # One block = imu_decimation ADC records followed by one IMU record
+        block_dtype = np.dtype([('adc', adc_dtype, (imu_decimation,)),
+                                ('imu', imu_dtype)])
+        n_blocks = len(data) // block_dtype.itemsize
+        blocks = np.frombuffer(data, dtype=block_dtype, count=n_blocks)
+        
+        # Trailing partial block: ADC records only (IMU record is short)
+        tail = data[n_blocks * block_dtype.itemsize:]
+        tail_adc = np.frombuffer(tail, dtype=adc_dtype,
+                                 count=min(imu_decimation, len(tail) // ADC_RECORD_SIZE))
+        return blocks['adc'], tail_adc, blocks['imu']
+    
+    @staticmethod
+    def _adc_length(np, adc_blocks, tail_adc) -> int:
+        """Number of ADC records before the end record (first byte 0xFF), same as iter_adc()"""
+        width = adc_blocks.shape[1]
+        step = max(1, ADC_CHUNK_RECORDS // width)
+        for i in range(0, len(adc_blocks), step):
+            timestamps = adc_blocks[i:i + step]['timestamp_offset_us'].reshape(-1)
+            end = np.flatnonzero((timestamps & 0xFF) == 0xFF)
+            if end.size:
+                return i * width + int(end[0])
+        
+        end = np.flatnonzero((tail_adc['timestamp_offset_us'] & 0xFF) == 0xFF)
+        return len(adc_blocks) * width + (int(end[0]) if end.size else len(tail_adc))
+    
+    def iter_adc(self) -> Iterator[ADCRecord]:
+        """Iterate ADC records without loading all into memory"""
+        for run in self._adc_runs():
+            for ts, raw, seq in _ADC_STRUCT.iter_unpack(run):
                 # Check for end record (first byte 0xFF)
-                if data[0] == 0xFF:
-                    break
-                
-                yield ADCRecord.from_bytes(data)
-                sample_count += 1
-                
-                # Skip IMU record if interleaved
-                if imu_decimation > 0 and sample_count % imu_decimation == 0:
-                    imu_data = f.read(IMU_RECORD_SIZE)
-                    if len(imu_data) < IMU_RECORD_SIZE:
-                        break
+                if ts & 0xFF == 0xFF:
+                    return
+                yield ADCRecord(ts, raw, seq)
+    
+    def _adc_runs(self) -> Iterator[bytes]:
+        """
+        The ADC record stream as byte strings of whole ADC records, one per
+        run between IMU records (or per chunk, without IMU), for
+        struct.iter_unpack(). Not truncated at the end record.
+        """
+        mm = self._mapping()
+        size = len(mm)
+        imu_decimation = self.imu_decimation
+        
+        # Slices are copies, so they don't pin the mapping
+        if imu_decimation == 0:
+            adc_bytes = block_size = ADC_CHUNK_RECORDS * ADC_RECORD_SIZE
+        else:
+            adc_bytes = imu_decimation * ADC_RECORD_SIZE
+            block_size = adc_bytes + IMU_RECORD_SIZE
+        
+        for offset in range(HEADER_SIZE, size, block_size):
+            # A trailing partial block only holds complete ADC records
+            end = min(offset + adc_bytes,
+                      size - (size - offset) % ADC_RECORD_SIZE)
+            yield mm[offset:end]
     
     def iter_imu(self) -> Iterator[IMURecord]:
         """Iterate IMU records without loading all into memory"""
-        with open(self.filepath, 'rb') as f:
-            f.seek(HEADER_SIZE)
-            
-            imu_decimation = (self._header.adc_sample_rate_hz // 
-                            self._header.imu_sample_rate_hz) if self._header.imu_sample_rate_hz > 0 else 0
-            
-            if imu_decimation == 0:
+        imu_decimation = self.imu_decimation
+        if imu_decimation == 0:
+            return
+        
+        mm = self._mapping()
+        adc_bytes = imu_decimation * ADC_RECORD_SIZE
+        block_size = adc_bytes + IMU_RECORD_SIZE
+        
+        # IMU records sit at fixed offsets; the ADC records before each one
+        # are only checked for the end record (first byte 0xFF)
+        for offset in range(HEADER_SIZE, len(mm) - block_size + 1, block_size):
+            if 0xFF in mm[offset:offset + adc_bytes:ADC_RECORD_SIZE]:
                 return
-            
-            sample_count = 0
-            while True:
-                # Read ADC record
-                adc_data = f.read(ADC_RECORD_SIZE)
-                if len(adc_data) < ADC_RECORD_SIZE:
-                    break
-                
-                if adc_data[0] == 0xFF:
-                    break
-                
-                sample_count += 1
-                
-                # Read IMU record at decimation points
-                if sample_count % imu_decimation == 0:
-                    imu_data = f.read(IMU_RECORD_SIZE)
-                    if len(imu_data) < IMU_RECORD_SIZE:
-                        break
-                    yield IMURecord.from_bytes(imu_data)
+            yield IMURecord(*_IMU_STRUCT.unpack_from(mm, offset + adc_bytes))
     
     def __repr__(self) -> str:
         return (f"LogFile('{self.filepath.name}', "
@@ -4,13 +4,21 @@ Visualization Module
 Generate plots for loadcell and IMU data using matplotlib.
 """
 
-from typing import Optional, Callable, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Optional, Callable, Tuple, List
 from .parser import LogFile
-from .analysis import find_peaks, find_accel_peaks
+from .analysis import LoadPeaks, _accel_arrays, _load_peaks, _loads_newtons
+from .calibration import calibrate_array
 
 
+# Resolution of saved figures
+PLOT_DPI = 150
+
+
+@lru_cache(maxsize=1)
 def _check_matplotlib():
-    """Check if matplotlib is available"""
+    """Check if matplotlib is available (pyplot is looked up once, then cached)"""
     try:
         import matplotlib.pyplot as plt
         return plt
@@ -19,6 +27,132 @@ def _check_matplotlib():
                         "Install with: pip install matplotlib")
 
 
+def _new_figure(plt, output_path: Optional[str], **kwargs):
+    """
+    Empty figure to draw on.
+    
+    When saving to a file this is a plain Figure, rendered off-screen by
+    savefig (Agg for raster formats) without creating a GUI window or
+    registering it with pyplot; otherwise a pyplot figure for plt.show().
+    """
+    if output_path:
+        from matplotlib.figure import Figure
+        return Figure(**kwargs)
+    return plt.figure(**kwargs)
+
+
+def _m4_indices(np, values, n_buckets: int):
+    """
+    Sample indices kept by M4 downsampling: the first, minimum, maximum and
+    last sample of each of n_buckets equal runs of values, sorted and
+    without duplicates.
+    
+    Drawn n_buckets pixel columns wide, the kept points give the same line
+    envelope as every sample (peaks between kept points are not lost, as
+    they are with stride sampling).
+    """
+    n = len(values)
+    size = -(-n // max(n_buckets, 1))
+    if size <= 4:
+        return np.arange(n)
+    
+    full = n - n % size
+    starts = np.arange(0, n, size)
+    blocks = values[:full].reshape(-1, size)
+    pieces = [starts, np.minimum(starts + size - 1, n - 1),
+              starts[:len(blocks)] + blocks.argmin(axis=1),
+              starts[:len(blocks)] + blocks.argmax(axis=1)]
+    if full < n:
+        pieces.append(np.array([full + values[full:].argmin(),
+                                full + values[full:].argmax()]))
+    return np.unique(np.concatenate(pieces))
+
+
+def _load_series(log: LogFile,
+                 calibration: Optional[Callable[[int], float]],
+                 width_px: int):
+    """
+    ADC samples to plot as (timestamps in s, loads) numpy arrays, M4
+    downsampled to width_px pixel columns.
+    
+    Loads are in N with a calibration, otherwise raw ADC / 1000 (scaled for
+    visibility). Extremes are picked on raw values (the same samples as on
+    loads, for any monotonic calibration), so only the kept samples are
+    calibrated.
+    """
+    import numpy as np
+    
+    # The log's cached columns, shared with _load_peak() and find_peaks()
+    adc = log.adc_columns
+    keep = _m4_indices(np, adc['raw_adc'], width_px)
+    raw = adc['raw_adc'][keep]
+    timestamps = adc['timestamp_offset_us'][keep] / 1_000_000
+    if calibration:
+        loads = calibrate_array(calibration, raw) * 9.81
+    else:
+        loads = raw / 1000.0
+    return timestamps, loads
+
+
+def _imu_series(log: LogFile, accel_scale: int = 0, gyro_scale: int = 0) -> Dict[str, Any]:
+    """
+    IMU data to plot, converted from one decode of the IMU records.
+    
+    Returns:
+        Dict of numpy arrays: 't' (s), 'ax', 'ay', 'az', 'mag' (g, as
+        IMURecord.accel_g()/accel_magnitude_g()) and 'gx', 'gy', 'gz'
+        (dps, as IMURecord.gyro_dps())
+    """
+    import numpy as np
+    
+    imu = log.imu_columns
+    ax, ay, az, mag = _accel_arrays(np, imu, accel_scale)
+    gyro_factor = [4.375, 8.75, 17.5, 35.0, 70.0][gyro_scale] / 1000.0
+    return {
+        't': imu['timestamp_offset_us'] / 1_000_000,
+        'ax': ax, 'ay': ay, 'az': az, 'mag': mag,
+        'gx': imu['gyro_x'] * gyro_factor,
+        'gy': imu['gyro_y'] * gyro_factor,
+        'gz': imu['gyro_z'] * gyro_factor,
+    }
+
+
+def _plot_series(ax, timestamps, values, width_px: int, **kwargs):
+    """ax.plot() of values M4 downsampled to width_px pixel columns (see _m4_indices())"""
+    import numpy as np
+    
+    keep = _m4_indices(np, values, width_px)
+    ax.plot(timestamps[keep], values[keep], **kwargs)
+
+
+def _load_peak(log: LogFile, calibration: Optional[Callable[[int], float]]) -> LoadPeaks:
+    """
+    find_peaks() max/min load, without its list of every sample above a
+    threshold (only the maximum is plotted).
+    """
+    import numpy as np
+    
+    adc = log.adc_columns
+    return _load_peaks(np, adc, _loads_newtons(np, adc['raw_adc'], calibration), None)
+
+
+def _load_summary(log: LogFile, calibration: Optional[Callable[[int], float]],
+                  width_px: int) -> Tuple[Any, Any, LoadPeaks]:
+    """_load_series() and _load_peak() for plot_summary(), sharing one ADC decode"""
+    timestamps, loads = _load_series(log, calibration, width_px)
+    return timestamps, loads, _load_peak(log, calibration)
+
+
+def _accel_peak(imu: Dict[str, Any]) -> Tuple[float, float]:
+    """(max_g, max_g_time_s) of an _imu_series(), as find_accel_peaks() gives them"""
+    mags = imu['mag']
+    if len(mags):
+        i_max = int(mags.argmax())
+        if mags[i_max] > 0.0:
+            return float(mags[i_max]), float(imu['t'][i_max])
+    return 0.0, 0.0
+
+
 def plot_load(log: LogFile,
               output_path: Optional[str] = None,
               calibration: Optional[Callable[[int], float]] = None,
@@ -36,28 +170,16 @@ def plot_load(log: LogFile,
         title: Plot title
         figsize: Figure size (width, height)
         mark_peaks: Whether to mark peak values
-        peak_threshold_n: Threshold for marking peaks
+        peak_threshold_n: Not used (only the maximum load is marked);
+                          kept for compatibility
     """
     plt = _check_matplotlib()
     
-    # Collect data (sample for large files)
-    timestamps = []
-    loads = []
-    
-    max_points = 100000  # Limit for reasonable plot performance
-    step = max(1, log.adc_count // max_points)
-    
-    for i, adc in enumerate(log.iter_adc()):
-        if i % step == 0:
-            timestamps.append(adc.timestamp_s)
-            if calibration:
-                kg = calibration(adc.raw_adc)
-                loads.append(kg * 9.81)
-            else:
-                # Show raw values if no calibration
-                loads.append(adc.raw_adc / 1000.0)  # Scale for visibility
+    # Collect data (downsampled to the saved figure's width)
+    timestamps, loads = _load_series(log, calibration, int(figsize[0] * PLOT_DPI))
     
-    fig, ax = plt.subplots(figsize=figsize)
+    fig = _new_figure(plt, output_path, figsize=figsize)
+    ax = fig.subplots()
     ax.plot(timestamps, loads, linewidth=0.5, color='#2196F3')
     
     ax.set_xlabel('Time (s)')
@@ -67,7 +189,7 @@ def plot_load(log: LogFile,
     
     # Mark peaks
     if mark_peaks:
-        peaks = find_peaks(log, threshold_n=peak_threshold_n, calibration=calibration)
+        peaks = _load_peak(log, calibration)
         if peaks.max_load_n > 0:
             ax.axhline(y=peaks.max_load_n, color='r', linestyle='--', alpha=0.5, 
                       label=f'Peak: {peaks.max_load_n:.2f} N')
@@ -75,11 +197,10 @@ def plot_load(log: LogFile,
                       color='r', s=100, zorder=5, marker='v')
             ax.legend()
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     if output_path:
-        plt.savefig(output_path, dpi=150)
-        plt.close()
+        fig.savefig(output_path, dpi=PLOT_DPI)
     else:
         plt.show()
 
@@ -105,63 +226,54 @@ def plot_accel(log: LogFile,
     """
     plt = _check_matplotlib()
     
-    timestamps = []
-    ax_list = []
-    ay_list = []
-    az_list = []
-    mag_list = []
-    
-    for imu in log.iter_imu():
-        timestamps.append(imu.timestamp_s)
-        ax, ay, az = imu.accel_g(accel_scale)
-        ax_list.append(ax)
-        ay_list.append(ay)
-        az_list.append(az)
-        mag_list.append(imu.accel_magnitude_g(accel_scale))
+    imu = _imu_series(log, accel_scale=accel_scale)
+    timestamps = imu['t']
+    width_px = int(figsize[0] * PLOT_DPI)
     
     if show_components and show_magnitude:
-        fig, axes = plt.subplots(2, 1, figsize=figsize, sharex=True)
-        ax_comp, ax_mag = axes
+        fig = _new_figure(plt, output_path, figsize=figsize)
+        ax_comp, ax_mag = fig.subplots(2, 1, sharex=True)
     elif show_components:
-        fig, ax_comp = plt.subplots(figsize=figsize)
+        fig = _new_figure(plt, output_path, figsize=figsize)
+        ax_comp = fig.subplots()
         ax_mag = None
     else:
-        fig, ax_mag = plt.subplots(figsize=figsize)
+        fig = _new_figure(plt, output_path, figsize=figsize)
+        ax_mag = fig.subplots()
         ax_comp = None
     
     if ax_comp is not None:
-        ax_comp.plot(timestamps, ax_list, label='X', linewidth=0.5, alpha=0.8)
-        ax_comp.plot(timestamps, ay_list, label='Y', linewidth=0.5, alpha=0.8)
-        ax_comp.plot(timestamps, az_list, label='Z', linewidth=0.5, alpha=0.8)
+        _plot_series(ax_comp, timestamps, imu['ax'], width_px, label='X', linewidth=0.5, alpha=0.8)
+        _plot_series(ax_comp, timestamps, imu['ay'], width_px, label='Y', linewidth=0.5, alpha=0.8)
+        _plot_series(ax_comp, timestamps, imu['az'], width_px, label='Z', linewidth=0.5, alpha=0.8)
         ax_comp.set_ylabel('Acceleration (g)')
         ax_comp.legend(loc='upper right')
         ax_comp.grid(True, alpha=0.3)
         ax_comp.set_title(title if ax_mag is None else f"{title} - Components")
     
     if ax_mag is not None:
-        ax_mag.plot(timestamps, mag_list, linewidth=0.5, color='#E91E63')
+        _plot_series(ax_mag, timestamps, imu['mag'], width_px, linewidth=0.5, color='#E91E63')
         ax_mag.set_xlabel('Time (s)')
         ax_mag.set_ylabel('Magnitude (g)')
         ax_mag.grid(True, alpha=0.3)
         ax_mag.set_title("Acceleration Magnitude" if ax_comp else title)
         
         # Mark peak
-        peaks = find_accel_peaks(log, accel_scale=accel_scale)
-        if peaks.max_g > 0:
-            ax_mag.axhline(y=peaks.max_g, color='r', linestyle='--', alpha=0.5)
-            ax_mag.scatter([peaks.max_g_time_s], [peaks.max_g], 
+        max_g, max_g_time_s = _accel_peak(imu)
+        if max_g > 0:
+            ax_mag.axhline(y=max_g, color='r', linestyle='--', alpha=0.5)
+            ax_mag.scatter([max_g_time_s], [max_g], 
                           color='r', s=100, zorder=5, marker='v',
-                          label=f'Peak: {peaks.max_g:.2f} g')
+                          label=f'Peak: {max_g:.2f} g')
             ax_mag.legend()
     
     if ax_comp is not None and ax_mag is None:
         ax_comp.set_xlabel('Time (s)')
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     if output_path:
-        plt.savefig(output_path, dpi=150)
-        plt.close()
+        fig.savefig(output_path, dpi=PLOT_DPI)
     else:
         plt.show()
 
@@ -183,22 +295,15 @@ def plot_gyro(log: LogFile,
     """
     plt = _check_matplotlib()
     
-    timestamps = []
-    gx_list = []
-    gy_list = []
-    gz_list = []
-    
-    for imu in log.iter_imu():
-        timestamps.append(imu.timestamp_s)
-        gx, gy, gz = imu.gyro_dps(gyro_scale)
-        gx_list.append(gx)
-        gy_list.append(gy)
-        gz_list.append(gz)
+    imu = _imu_series(log, gyro_scale=gyro_scale)
+    timestamps = imu['t']
+    width_px = int(figsize[0] * PLOT_DPI)
     
-    fig, ax = plt.subplots(figsize=figsize)
-    ax.plot(timestamps, gx_list, label='X', linewidth=0.5, alpha=0.8)
-    ax.plot(timestamps, gy_list, label='Y', linewidth=0.5, alpha=0.8)
-    ax.plot(timestamps, gz_list, label='Z', linewidth=0.5, alpha=0.8)
+    fig = _new_figure(plt, output_path, figsize=figsize)
+    ax = fig.subplots()
+    _plot_series(ax, timestamps, imu['gx'], width_px, label='X', linewidth=0.5, alpha=0.8)
+    _plot_series(ax, timestamps, imu['gy'], width_px, label='Y', linewidth=0.5, alpha=0.8)
+    _plot_series(ax, timestamps, imu['gz'], width_px, label='Z', linewidth=0.5, alpha=0.8)
     
     ax.set_xlabel('Time (s)')
     ax.set_ylabel('Angular Rate (°/s)')
@@ -206,11 +311,10 @@ def plot_gyro(log: LogFile,
     ax.legend(loc='upper right')
     ax.grid(True, alpha=0.3)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     if output_path:
-        plt.savefig(output_path, dpi=150)
-        plt.close()
+        fig.savefig(output_path, dpi=PLOT_DPI)
     else:
         plt.show()
 
@@ -232,56 +336,45 @@ def plot_summary(log: LogFile,
     """
     plt = _check_matplotlib()
     
-    fig = plt.figure(figsize=figsize)
+    width_px = int(figsize[0] * PLOT_DPI) // 2
+    
+    # The load data (ADC columns) and the IMU data (gyro at its default
+    # scale) are independent: prepare the load side on a worker thread
+    # while this one does the IMU side. The numpy work releases the GIL;
+    # matplotlib calls all stay on this thread.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        load_future = pool.submit(_load_summary, log, calibration, width_px)
+        imu = _imu_series(log, accel_scale=accel_scale)
+        max_g, max_g_time_s = _accel_peak(imu)
+        timestamps, loads, load_peaks = load_future.result()
+    
+    fig = _new_figure(plt, output_path, figsize=figsize)
     
     # Create grid
     gs = fig.add_gridspec(3, 2, height_ratios=[2, 2, 1], hspace=0.3, wspace=0.3)
     
     # Load plot (top left)
     ax_load = fig.add_subplot(gs[0, 0])
-    timestamps = []
-    loads = []
-    step = max(1, log.adc_count // 50000)
-    for i, adc in enumerate(log.iter_adc()):
-        if i % step == 0:
-            timestamps.append(adc.timestamp_s)
-            if calibration:
-                loads.append(calibration(adc.raw_adc) * 9.81)
-            else:
-                loads.append(adc.raw_adc / 1000.0)
-    
     ax_load.plot(timestamps, loads, linewidth=0.5, color='#2196F3')
     ax_load.set_ylabel('Load (N)' if calibration else 'Raw (scaled)')
     ax_load.set_title('Load')
     ax_load.grid(True, alpha=0.3)
     
+    # IMU data for the next three plots
+    timestamps = imu['t']
+    
     # Acceleration magnitude plot (top right)
     ax_accel = fig.add_subplot(gs[0, 1])
-    timestamps = []
-    mags = []
-    for imu in log.iter_imu():
-        timestamps.append(imu.timestamp_s)
-        mags.append(imu.accel_magnitude_g(accel_scale))
-    
-    ax_accel.plot(timestamps, mags, linewidth=0.5, color='#E91E63')
+    _plot_series(ax_accel, timestamps, imu['mag'], width_px, linewidth=0.5, color='#E91E63')
     ax_accel.set_ylabel('Acceleration (g)')
     ax_accel.set_title('Acceleration Magnitude')
     ax_accel.grid(True, alpha=0.3)
     
     # Acceleration components (middle left)
     ax_comp = fig.add_subplot(gs[1, 0])
-    timestamps = []
-    ax_list, ay_list, az_list = [], [], []
-    for imu in log.iter_imu():
-        timestamps.append(imu.timestamp_s)
-        ax, ay, az = imu.accel_g(accel_scale)
-        ax_list.append(ax)
-        ay_list.append(ay)
-        az_list.append(az)
-    
-    ax_comp.plot(timestamps, ax_list, label='X', linewidth=0.5, alpha=0.8)
-    ax_comp.plot(timestamps, ay_list, label='Y', linewidth=0.5, alpha=0.8)
-    ax_comp.plot(timestamps, az_list, label='Z', linewidth=0.5, alpha=0.8)
+    _plot_series(ax_comp, timestamps, imu['ax'], width_px, label='X', linewidth=0.5, alpha=0.8)
+    _plot_series(ax_comp, timestamps, imu['ay'], width_px, label='Y', linewidth=0.5, alpha=0.8)
+    _plot_series(ax_comp, timestamps, imu['az'], width_px, label='Z', linewidth=0.5, alpha=0.8)
     ax_comp.set_xlabel('Time (s)')
     ax_comp.set_ylabel('Acceleration (g)')
     ax_comp.set_title('Acceleration Components')
@@ -290,18 +383,9 @@ def plot_summary(log: LogFile,
     
     # Gyro (middle right)
     ax_gyro = fig.add_subplot(gs[1, 1])
-    timestamps = []
-    gx_list, gy_list, gz_list = [], [], []
-    for imu in log.iter_imu():
-        timestamps.append(imu.timestamp_s)
-        gx, gy, gz = imu.gyro_dps()
-        gx_list.append(gx)
-        gy_list.append(gy)
-        gz_list.append(gz)
-    
-    ax_gyro.plot(timestamps, gx_list, label='X', linewidth=0.5, alpha=0.8)
-    ax_gyro.plot(timestamps, gy_list, label='Y', linewidth=0.5, alpha=0.8)
-    ax_gyro.plot(timestamps, gz_list, label='Z', linewidth=0.5, alpha=0.8)
+    _plot_series(ax_gyro, timestamps, imu['gx'], width_px, label='X', linewidth=0.5, alpha=0.8)
+    _plot_series(ax_gyro, timestamps, imu['gy'], width_px, label='Y', linewidth=0.5, alpha=0.8)
+    _plot_series(ax_gyro, timestamps, imu['gz'], width_px, label='Z', linewidth=0.5, alpha=0.8)
     ax_gyro.set_xlabel('Time (s)')
     ax_gyro.set_ylabel('Angular Rate (°/s)')
     ax_gyro.set_title('Gyroscope')
@@ -312,9 +396,6 @@ def plot_summary(log: LogFile,
     ax_stats = fig.add_subplot(gs[2, :])
     ax_stats.axis('off')
     
-    load_peaks = find_peaks(log, calibration=calibration)
-    accel_peaks = find_accel_peaks(log, accel_scale=accel_scale)
-    
     stats_text = (
         f"File: {log.filepath.name}\n"
         f"Duration: {log.duration_seconds:.2f}s | "
@@ -322,7 +403,7 @@ def plot_summary(log: LogFile,
         f"IMU Samples: {log.imu_count:,} | "
         f"Dropped: {log.dropped_count}\n\n"
         f"Peak Load: {load_peaks.max_load_n:.2f} N at {load_peaks.max_load_time_s:.3f}s\n"
-        f"Peak Accel: {accel_peaks.max_g:.2f} g at {accel_peaks.max_g_time_s:.3f}s"
+        f"Peak Accel: {max_g:.2f} g at {max_g_time_s:.3f}s"
     )
     
     ax_stats.text(0.5, 0.5, stats_text, transform=ax_stats.transAxes,
@@ -330,11 +411,10 @@ def plot_summary(log: LogFile,
                   fontfamily='monospace',
                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
-    plt.suptitle(f"Log Summary: {log.header.loadcell_id or 'Unknown'}", fontsize=14)
+    fig.suptitle(f"Log Summary: {log.header.loadcell_id or 'Unknown'}", fontsize=14)
     
     if output_path:
-        plt.savefig(output_path, dpi=150, bbox_inches='tight')
-        plt.close()
+        fig.savefig(output_path, dpi=PLOT_DPI, bbox_inches='tight')
     else:
         plt.show()
 
@@ -9,24 +9,129 @@ Validates log file integrity through:
 """
 
 import struct
+import zlib
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from itertools import chain, islice
+from typing import Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+try:
+    from fastcrc import crc32 as fastcrc32
+except ImportError:
+    fastcrc32 = None
+
 from .parser import (
     LogFile, FileHeader, ADCRecord, FileFooter,
-    FILE_MAGIC, FOOTER_MAGIC, HEADER_SIZE, ADC_RECORD_SIZE
+    FILE_MAGIC, FOOTER_MAGIC, HEADER_SIZE, ADC_RECORD_SIZE, ADC_CHUNK_RECORDS,
+    _ADC_STRUCT
 )
 
+# Bytes checksummed per step when verifying the file CRC
+CRC_CHUNK_SIZE = 1 << 20
+
 
 def crc32_ieee(data: bytes, crc: int = 0) -> int:
     """
     Calculate CRC32 using IEEE 802.3 polynomial (0x04C11DB7).
     Compatible with ESP32's esp_crc32_le() function.
+    
+    Pass the previous result as crc to continue over the next chunk.
+    Uses fastcrc when installed (PCLMULQDQ/ARMv8 CRC folding, several
+    times faster than zlib on large files).
+    """
+    if fastcrc32 is not None:
+        # CRC-32/ISO-HDLC is the same CRC as zlib's and the ESP32's
+        try:
+            return fastcrc32.iso_hdlc(data, crc)
+        except TypeError:
+            pass    # A release that only takes bytes, not memoryview slices
+    # zlib.crc32 uses same polynomial as ESP32
+    return zlib.crc32(data, crc)
+
+
+def _numpy():
+    """numpy module, or None if not installed (records are decoded one at a time)"""
+    try:
+        import numpy as np
+        return np
+    except ImportError:
+        return None
+
+
+def _adc_chunks(log: LogFile, np) -> Iterator[Tuple[Any, Any]]:
+    """
+    (sequence numbers, timestamps) of the log's ADC records, in file order
+    and up to ADC_CHUNK_RECORDS records at a time: int64/uint32 numpy arrays
+    (copies, so none outlive the log's mapping), or tuples if np is None.
+    
+    Sequence numbers are signed, as in ADCRecord.
+    """
+    if np is not None:
+        for chunk in log.iter_adc_arrays(ADC_CHUNK_RECORDS):
+            # Reinterpret in place, then one widening copy
+            yield (chunk['sequence_num'].view(np.int32).astype(np.int64),
+                   chunk['timestamp_offset_us'].copy())
+        return
+    
+    # Field tuples straight from struct.iter_unpack() (no ADCRecord objects)
+    records = chain.from_iterable(map(_ADC_STRUCT.iter_unpack, _adc_runs(log)))
+    while True:
+        batch = list(islice(records, ADC_CHUNK_RECORDS))
+        if not batch:
+            return
+        timestamps, _, sequence_nums = zip(*batch)
+        yield sequence_nums, timestamps
+
+
+def _adc_runs(log: LogFile) -> Iterator[bytes]:
+    """LogFile._adc_runs() up to the end record (first byte 0xFF)"""
+    for run in log._adc_runs():
+        end = run[::ADC_RECORD_SIZE].find(0xFF)
+        if end >= 0:
+            yield run[:end * ADC_RECORD_SIZE]
+            return
+        yield run
+
+
+def _chunk_gaps(np, sequence_nums, timestamps, start: int,
+                expected_seq: int) -> Tuple[List['Gap'], int]:
+    """
+    Sequence gaps in one chunk from _adc_chunks().
+    
+    Args:
+        start: Record index of the chunk's first record
+        expected_seq: Sequence number expected for that record
+    
+    Returns:
+        (gaps, sequence number expected after the chunk)
     """
-    import binascii
-    # Python's binascii.crc32 uses same polynomial as ESP32
-    return binascii.crc32(data, crc) & 0xFFFFFFFF
+    if len(sequence_nums) == 0:
+        return [], expected_seq
+    
+    if np is None:
+        gaps = []
+        for i, seq in enumerate(sequence_nums):
+            if seq != expected_seq:
+                gaps.append(Gap(position=start + i, expected_seq=expected_seq,
+                                actual_seq=seq, missing_count=seq - expected_seq,
+                                timestamp_us=timestamps[i]))
+            expected_seq = seq + 1
+        return gaps, expected_seq
+    
+    # Each record should follow the one before it (the first, the
+    # previous chunk); Gap objects are only built where one doesn't
+    expected = np.empty_like(sequence_nums)
+    expected[0] = expected_seq
+    np.add(sequence_nums[:-1], 1, out=expected[1:])
+    indices = np.flatnonzero(sequence_nums != expected)
+    gaps = [
+        Gap(position=start + i, expected_seq=e, actual_seq=seq,
+            missing_count=seq - e, timestamp_us=t)
+        for i, e, seq, t in zip(indices.tolist(), expected[indices].tolist(),
+                                sequence_nums[indices].tolist(),
+                                timestamps[indices].tolist())
+    ]
+    return gaps, int(sequence_nums[-1]) + 1
 
 
 @dataclass
@@ -169,70 +274,66 @@ def validate_file(filepath: str, check_crc: bool = True,
         report.expected_adc_count = log.footer.total_adc_samples
         report.expected_imu_count = log.footer.total_imu_samples
     
-    # Count records and check gaps
+    # Parse records
+    imu_decimation = (log.header.adc_sample_rate_hz // 
+                    log.header.imu_sample_rate_hz) if log.header.imu_sample_rate_hz > 0 else 0
+    
+    def data_end(adc_count: int) -> int:
+        """File offset just past the first adc_count ADC records (and their IMU records)"""
+        if imu_decimation == 0:
+            return HEADER_SIZE + adc_count * ADC_RECORD_SIZE
+        blocks, slots = divmod(adc_count, imu_decimation)
+        return (HEADER_SIZE + blocks * (imu_decimation * ADC_RECORD_SIZE + 16)
+                + slots * ADC_RECORD_SIZE)
+    
+    # One pass over the file: each chunk of records is checked for gaps and
+    # then checksummed while it is still in cache. The CRC covers all data
+    # except the footer, which may run past the last record.
+    verify_crc = bool(check_crc and log.footer and log.footer.crc32 != 0)
+    crc_size = file_size - 32
+    np = _numpy()
+    crc = 0
+    crc_done = 0
     adc_count = 0
-    imu_count = 0
     expected_seq = 0
     
-    with open(filepath, 'rb') as f:
-        # Skip header
-        f.seek(HEADER_SIZE)
-        
-        # Calculate CRC if requested
-        if check_crc and log.footer and log.footer.crc32 != 0:
-            f.seek(0)
-            # Read all data except footer
-            data_size = file_size - 32  # Exclude footer
-            data = f.read(data_size)
-            report.crc_computed = crc32_ieee(data)
-            report.crc_expected = log.footer.crc32
+    # The CRC reads memoryview slices of the log's own (sequentially advised)
+    # mapping: no copies and no second mapping. The log is closed after the
+    # scan; everything used below is already parsed.
+    with log, memoryview(log._mapping()) as data:
+        for sequence_nums, timestamps in _adc_chunks(log, np):
+            if check_gaps:
+                gaps, expected_seq = _chunk_gaps(np, sequence_nums, timestamps,
+                                                 adc_count, expected_seq)
+                report.gaps.extend(gaps)
+                report.total_missing += sum(gap.missing_count for gap in gaps)
             
-            if report.crc_computed != report.crc_expected:
-                report.crc_valid = False
-                report.add_error("CRC32 mismatch - file may be corrupted")
+            adc_count += len(sequence_nums)
             
-            # Reset to after header
-            f.seek(HEADER_SIZE)
+            if verify_crc:
+                end = min(data_end(adc_count), crc_size)
+                if end > crc_done:
+                    crc = crc32_ieee(data[crc_done:end], crc)
+                    crc_done = end
         
-        # Parse records
-        imu_decimation = (log.header.adc_sample_rate_hz // 
-                        log.header.imu_sample_rate_hz) if log.header.imu_sample_rate_hz > 0 else 0
+        if verify_crc:
+            for offset in range(crc_done, crc_size, CRC_CHUNK_SIZE):
+                crc = crc32_ieee(data[offset:min(offset + CRC_CHUNK_SIZE, crc_size)], crc)
+    
+    # One IMU record after every imu_decimation ADC records, if all its
+    # bytes are in the file
+    imu_count = 0
+    if imu_decimation > 0:
+        imu_count = min(adc_count // imu_decimation,
+                        (file_size - HEADER_SIZE) // (imu_decimation * ADC_RECORD_SIZE + 16))
+    
+    if verify_crc:
+        report.crc_computed = crc
+        report.crc_expected = log.footer.crc32
         
-        record_index = 0
-        while True:
-            data = f.read(ADC_RECORD_SIZE)
-            if len(data) < ADC_RECORD_SIZE:
-                break
-            
-            # Check for end record
-            if data[0] == 0xFF:
-                break
-            
-            adc = ADCRecord.from_bytes(data)
-            adc_count += 1
-            
-            # Check sequence gaps
-            if check_gaps:
-                if adc.sequence_num != expected_seq:
-                    gap = Gap(
-                        position=record_index,
-                        expected_seq=expected_seq,
-                        actual_seq=adc.sequence_num,
-                        missing_count=adc.sequence_num - expected_seq,
-                        timestamp_us=adc.timestamp_offset_us
-                    )
-                    report.gaps.append(gap)
-                    report.total_missing += gap.missing_count
-                
-                expected_seq = adc.sequence_num + 1
-            
-            record_index += 1
-            
-            # Skip IMU record if interleaved
-            if imu_decimation > 0 and adc_count % imu_decimation == 0:
-                imu_data = f.read(16)
-                if len(imu_data) >= 16:
-                    imu_count += 1
+        if report.crc_computed != report.crc_expected:
+            report.crc_valid = False
+            report.add_error("CRC32 mismatch - file may be corrupted")
     
     report.adc_count = adc_count
     report.imu_count = imu_count
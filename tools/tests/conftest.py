@@ -0,0 +1,112 @@
+"""
+Shared fixtures: synthetic log files in the format of docs/BINARY_FORMAT.md
+and a switch that hides numpy, so each vectorized path can be checked
+against the pure-Python fallback it replaced.
+"""
+
+import random
+import struct
+import sys
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Same import setup as the command-line tools
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+HEADER = struct.Struct('<IHHIIQ32sBBBBB3x')
+ADC_RECORD = struct.Struct('<IiI')
+IMU_RECORD = struct.Struct('<Ihhhhhh')
+FOOTER = struct.Struct('<IQQIII')
+
+
+def write_log(path: Path, sequence_nums, adc_rate_hz: int = 4000,
+              imu_rate_hz: int = 1000, end_record: bool = True,
+              footer: bool = True, seed: int = 1, timestamps=None) -> Path:
+    """
+    Write a log with one ADC record per sequence number (negative values
+    are written as their unsigned 32-bit pattern) and one IMU record after
+    every adc_rate_hz / imu_rate_hz ADC records, 50 us after that ADC record.
+    
+    ADC timestamps default to a steady adc_rate_hz from 0; others (one per
+    sequence number) are wrapped to 32 bits like the firmware's.
+    """
+    rnd = random.Random(seed)
+    data = bytearray(HEADER.pack(0x474C434C, 1, 64, adc_rate_hz, imu_rate_hz,
+                                 1700000000000000, b'TEST-0001', 0, 1, 24, 0, 1))
+    decimation = adc_rate_hz // imu_rate_hz if imu_rate_hz else 0
+    n_imu = 0
+    if timestamps is None:
+        timestamps = [i * 1_000_000 // adc_rate_hz for i in range(len(sequence_nums))]
+    for i, (seq, timestamp_us) in enumerate(zip(sequence_nums, timestamps)):
+        raw = rnd.randint(-3_000_000, 6_000_000)
+        data += ADC_RECORD.pack(timestamp_us & 0xFFFFFFFF, raw, seq & 0xFFFFFFFF)
+        if decimation and (i + 1) % decimation == 0:
+            data += IMU_RECORD.pack((timestamp_us + 50) & 0xFFFFFFFF,
+                                    *(rnd.randint(-32768, 32767) for _ in range(6)))
+            n_imu += 1
+    if end_record:
+        data += struct.pack('<BII', 0xFF, len(sequence_nums) + n_imu, 0)
+    if footer:
+        duration_us = (len(sequence_nums) - 1) * 1_000_000 // adc_rate_hz
+        data += FOOTER.pack(0xF007F007, len(sequence_nums), n_imu, 0, duration_us,
+                            zlib.crc32(bytes(data)))
+    path.write_bytes(bytes(data))
+    return path
+
+
+@pytest.fixture
+def sample_logs(tmp_path):
+    """
+    Logs covering signed and wrapping sequence numbers, gaps, a partial
+    IMU block, no IMU data, a file cut off without end record or footer,
+    and timestamps that wrap or jump backwards.
+    """
+    sequence_nums = (list(range(-5, 700)) + list(range(710, 1500))
+                     + [0x7FFFFFFF, -0x80000000, 3])
+    return [
+        write_log(tmp_path / 'imu.bin', sequence_nums),
+        write_log(tmp_path / 'adc_only.bin', sequence_nums, imu_rate_hz=0, seed=2),
+        write_log(tmp_path / 'cut.bin', sequence_nums[:1001], end_record=False,
+                  footer=False, seed=3),
+        *time_travel_logs(tmp_path),
+    ]
+
+
+def time_travel_logs(tmp_path: Path):
+    """
+    A log whose timestamp offset wraps past 2**32 us at record 799 (after
+    ~71.6 minutes on the device), and one whose timestamps jump back every
+    few hundred records and end in a run of low, garbage-like values.
+    Timestamps stay even: a low byte of 0xFF would read as the end record.
+    """
+    n = 1600
+    rnd = random.Random(5)
+    jumbled = []
+    timestamp_us = 10_000_000
+    for i in range(n):
+        timestamp_us += 250 if i % 301 else -2 * rnd.randint(1, 200_000)
+        jumbled.append(timestamp_us)
+    jumbled[-200:] = sorted(2 * rnd.randint(0, 2_500) for _ in range(200))
+    return [
+        write_log(tmp_path / 'wrapped.bin', range(n), seed=4,
+                  timestamps=[2**32 - 200_000 + i * 250 for i in range(n)]),
+        write_log(tmp_path / 'jumbled.bin', range(n), seed=5, timestamps=jumbled),
+    ]
+
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    """
+    `with without_numpy():` makes `import numpy` fail inside the block,
+    selecting the pure-Python code paths.
+    """
+    @contextmanager
+    def hidden():
+        with monkeypatch.context() as patch:
+            patch.setitem(sys.modules, 'numpy', None)
+            yield
+    return hidden
@@ -0,0 +1,161 @@
+"""Analysis: numpy paths against the pure-Python loops"""
+
+import dataclasses
+import hashlib
+import random
+
+import pytest
+
+# Each test compares the numpy path with the fallback
+pytest.importorskip('numpy')
+
+from loadcell_parser import LogFile, PiecewiseCalibration
+from loadcell_parser.analysis import (compute_statistics, detect_events, find_accel_peaks,
+                                      find_peaks, get_accel_statistics, get_load_statistics)
+
+
+CALIBRATION = PiecewiseCalibration([(0, 0), (10, 5000), (50, 20000)])
+
+
+def _linear_calibration(raw):
+    return raw * 2.5e-6 - 1.0
+
+
+# Results of the initial commit's record-by-record analysis on the conftest
+# logs, with _linear_calibration
+
+# detect_events(load_threshold_n=40.0, accel_threshold_g=1.2, min_duration_s=0.0):
+# event count and sha256 prefix of repr([(type, start_time_s, end_time_s), ...])
+EVENTS_GOLDEN = {
+    'imu.bin': (307, 'ff4cc3a76aac108a'),
+    'adc_only.bin': (257, '7d8a712e6ad5d2fd'),
+    'cut.bin': (189, '1ea53550548201a7'),
+    'wrapped.bin': (310, '9ade49df70f6d943'),
+    'jumbled.bin': (293, 'e1a7b2e3a424f6c0'),
+}
+
+# find_peaks(threshold_n=60.0): max, its time, min, its time, peaks above threshold
+PEAKS_GOLDEN = {
+    'imu.bin': (137.325849075, 0.365, -83.14215345000001, 0.11625, 690),
+    'adc_only.bin': (137.07853897500001, 0.34325, -83.15608365000001, 0.334, 702),
+    'cut.bin': (137.32739415, 0.1775, -83.297274075, 0.113, 468),
+    'wrapped.bin': (137.09698177500002, 0.0575, -83.22026557500001, 0.024, 696),
+    'jumbled.bin': (137.152898775, 9.230104, -83.20412812500001, 9.71967, 706),
+}
+
+# get_load_statistics(): count, mean, std, rms
+LOAD_STATISTICS_GOLDEN = {
+    'imu.bin': (1498, 27.542101583511354, 64.25690659146834, 69.91078174603075),
+    'adc_only.bin': (1498, 26.744879818357813, 64.14829717981607, 69.50030667247738),
+    'cut.bin': (1001, 27.124890325399605, 64.06496787712445, 69.57068193040759),
+    'wrapped.bin': (1600, 27.57951049992188, 63.67983431269491, 69.39561007374729),
+    'jumbled.bin': (1600, 25.094078406562502, 63.45407897065998, 68.23586233857867),
+}
+
+
+def _assert_close(actual, expected):
+    """Equal, except floats only to rounding (summed in a different order)"""
+    if dataclasses.is_dataclass(expected):
+        assert type(actual) is type(expected)
+        for f in dataclasses.fields(expected):
+            _assert_close(getattr(actual, f.name), getattr(expected, f.name))
+    elif isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            _assert_close(actual[key], expected[key])
+    elif isinstance(expected, (list, tuple)):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_close(a, e)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    else:
+        assert actual == expected
+
+
+def _both_paths(without_numpy, func, path, **kwargs):
+    """func(LogFile, **kwargs) with numpy, then without"""
+    with LogFile(str(path)) as log:
+        fast = func(log, **kwargs)
+    with without_numpy(), LogFile(str(path)) as log:
+        slow = func(log, **kwargs)
+    return fast, slow
+
+
+@pytest.mark.parametrize('calibration', [None, CALIBRATION])
+@pytest.mark.parametrize('threshold_n', [0.0, 40.0, 1e9])
+def test_find_peaks_matches_fallback(sample_logs, without_numpy, calibration, threshold_n):
+    for path in sample_logs:
+        fast, slow = _both_paths(without_numpy, find_peaks, path,
+                                 threshold_n=threshold_n, calibration=calibration)
+        _assert_close(fast, slow)
+
+
+@pytest.mark.parametrize('threshold_g', [0.5, 1.0, 100.0])
+def test_find_accel_peaks_matches_fallback(sample_logs, without_numpy, threshold_g):
+    for path in sample_logs:
+        fast, slow = _both_paths(without_numpy, find_accel_peaks, path,
+                                 threshold_g=threshold_g)
+        _assert_close(fast, slow)
+
+
+def test_log_statistics_match_fallback(sample_logs, without_numpy):
+    for path in sample_logs:
+        _assert_close(*_both_paths(without_numpy, get_load_statistics, path,
+                                   calibration=CALIBRATION))
+        _assert_close(*_both_paths(without_numpy, get_accel_statistics, path))
+
+
+_RNG = random.Random(4)
+
+
+@pytest.mark.parametrize('values', [
+    [],
+    [3.5],
+    [_RNG.uniform(-1e3, 1e3) for _ in range(1000)],
+    [1e6 + _RNG.uniform(-1, 1) for _ in range(1000)],   # Large offset
+])
+def test_compute_statistics_matches_fallback(without_numpy, values):
+    fast = compute_statistics(values)
+    with without_numpy():
+        slow = compute_statistics(values)
+    _assert_close(fast, slow)
+
+
+def test_detect_events_matches_fallback(sample_logs, without_numpy):
+    for path in sample_logs:
+        fast, slow = _both_paths(without_numpy, detect_events, path,
+                                 load_threshold_n=40.0, accel_threshold_g=1.2,
+                                 min_duration_s=0.0)
+        _assert_close(fast, slow)
+
+
+def test_detect_events_are_ordered_by_start_time(sample_logs, without_numpy):
+    # wrapped.bin and jumbled.bin have timestamps that go backwards
+    for path in sample_logs:
+        for events in _both_paths(without_numpy, detect_events, path,
+                                  load_threshold_n=40.0, accel_threshold_g=1.2,
+                                  min_duration_s=0.0):
+            starts = [event['start_time_s'] for event in events]
+            assert starts == sorted(starts), path.name
+
+
+def test_results_match_original_output(sample_logs, without_numpy):
+    for path in sample_logs:
+        for events in _both_paths(without_numpy, detect_events, path,
+                                  load_threshold_n=40.0, accel_threshold_g=1.2,
+                                  min_duration_s=0.0):
+            key = repr([(e['type'], e['start_time_s'], e['end_time_s']) for e in events])
+            assert (len(events), hashlib.sha256(key.encode()).hexdigest()[:16]) == \
+                EVENTS_GOLDEN[path.name], path.name
+        
+        for peaks in _both_paths(without_numpy, find_peaks, path,
+                                 threshold_n=60.0, calibration=_linear_calibration):
+            _assert_close((peaks.max_load_n, peaks.max_load_time_s, peaks.min_load_n,
+                           peaks.min_load_time_s, len(peaks.peaks_above_threshold)),
+                          PEAKS_GOLDEN[path.name])
+        
+        for stats in _both_paths(without_numpy, get_load_statistics, path,
+                                 calibration=_linear_calibration):
+            _assert_close((stats.count, stats.mean, stats.std, stats.rms),
+                          LOAD_STATISTICS_GOLDEN[path.name])
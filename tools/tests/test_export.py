@@ -0,0 +1,126 @@
+"""CSV/JSON export: numpy fast paths against the pure-Python writers"""
+
+import csv
+import hashlib
+import io
+import json
+from contextlib import nullcontext
+
+import pytest
+
+# Each test compares the numpy path with the fallback
+pytest.importorskip('numpy')
+
+from loadcell_parser import LogFile, PiecewiseCalibration, to_csv, to_json
+from loadcell_parser import export
+
+
+CALIBRATIONS = [
+    None,
+    PiecewiseCalibration([(0, 0), (10, 5000), (50, 20000)]),
+    lambda raw: raw * 2.5e-6 - 1.0,     # Not vectorized: called per sample
+]
+
+# sha256 prefix of to_csv(include_imu=True) output by (log, calibrated with
+# the lambda above), as written by the initial commit's csv.writer loop
+CSV_GOLDEN = {
+    ('imu.bin', False): '0eb0c9683e5fd807',
+    ('imu.bin', True): 'c5a79f9dc252defd',
+    ('adc_only.bin', False): 'edd96427322afbc8',
+    ('adc_only.bin', True): 'dc44c371d1edf646',
+    ('cut.bin', False): 'afca7b6d5c9305b0',
+    ('cut.bin', True): '3df1f3ee71b0a8b4',
+    ('wrapped.bin', False): '14e88947ede9969b',
+    ('wrapped.bin', True): 'b4a485b38bd31d38',
+    ('jumbled.bin', False): 'ee4711e685d050ab',
+    ('jumbled.bin', True): 'f3f1204b4bca91e8',
+}
+
+
+def _csv_text(path, **kwargs) -> str:
+    f = io.StringIO(newline='')
+    with LogFile(str(path)) as log:
+        to_csv(log, f, **kwargs)
+    return f.getvalue()
+
+
+def _json_data(path, tmp_path, **kwargs):
+    output = tmp_path / 'out.json'
+    with LogFile(str(path)) as log:
+        to_json(log, str(output), **kwargs)
+    return json.loads(output.read_text())
+
+
+def _assert_same_json(actual, expected):
+    """Equal, except floats only to rounding (summed in a different order)"""
+    if isinstance(expected, float):
+        assert actual == pytest.approx(expected, rel=1e-12, abs=1e-12)
+    elif isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            _assert_same_json(actual[key], expected[key])
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            _assert_same_json(a, e)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize('calibration', CALIBRATIONS)
+@pytest.mark.parametrize('include_imu', [False, True])
+def test_csv_matches_fallback(sample_logs, without_numpy, monkeypatch,
+                              calibration, include_imu):
+    # Small chunks, so IMU placement crosses chunk boundaries
+    monkeypatch.setattr(export, 'CSV_CHUNK_ROWS', 256)
+    for path in sample_logs:
+        fast = _csv_text(path, include_imu=include_imu, calibration=calibration)
+        with without_numpy():
+            slow = _csv_text(path, include_imu=include_imu, calibration=calibration)
+        assert fast == slow, path.name
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_csv_matches_original_output(sample_logs, without_numpy, monkeypatch, use_numpy):
+    monkeypatch.setattr(export, 'CSV_CHUNK_ROWS', 256)
+    for path in sample_logs:
+        for calibrated in (False, True):
+            with nullcontext() if use_numpy else without_numpy():
+                text = _csv_text(path, calibration=CALIBRATIONS[2] if calibrated else None)
+            digest = hashlib.sha256(text.encode()).hexdigest()[:16]
+            assert digest == CSV_GOLDEN[path.name, calibrated], (path.name, calibrated)
+
+
+def test_csv_jobs_match_single_process(sample_logs, monkeypatch):
+    monkeypatch.setattr(export, 'CSV_CHUNK_ROWS', 256)
+    path = sample_logs[0]
+    assert _csv_text(path, jobs=2) == _csv_text(path, jobs=1)
+
+
+def test_csv_sequence_numbers_are_signed(sample_logs):
+    path = sample_logs[0]
+    rows = list(csv.DictReader(io.StringIO(_csv_text(path, include_imu=False))))
+    with LogFile(str(path)) as log:
+        expected = [adc.sequence_num for adc in log.iter_adc()]
+    assert [int(row['sequence_num']) for row in rows] == expected
+    assert min(expected) < 0
+
+
+@pytest.mark.parametrize('calibration', CALIBRATIONS[:2])
+def test_json_matches_fallback(sample_logs, tmp_path, without_numpy, calibration):
+    for path in sample_logs:
+        fast = _json_data(path, tmp_path, include_data=True, calibration=calibration)
+        with without_numpy():
+            slow = _json_data(path, tmp_path, include_data=True, calibration=calibration)
+        _assert_same_json(fast, slow)
+
+
+def test_csv_imu_placement_across_a_timestamp_wrap(sample_logs, monkeypatch):
+    monkeypatch.setattr(export, 'CSV_CHUNK_ROWS', 256)
+    path = next(path for path in sample_logs if path.name == 'wrapped.bin')
+    rows = list(csv.DictReader(io.StringIO(_csv_text(path))))
+    # As in the record-by-record writer: IMU records 0-198 go on every
+    # fourth row; record 199 (2**32 - 200 us) waits for an ADC timestamp
+    # that never comes after the wrap, and holds back all later records
+    imu_rows = [i for i, row in enumerate(rows) if row['accel_x_g']]
+    assert imu_rows == list(range(4, 800, 4))
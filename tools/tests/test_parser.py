@@ -0,0 +1,45 @@
+"""LogFile: bulk numpy readers against the record iterators"""
+
+import struct
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from loadcell_parser import LogFile
+from loadcell_parser.parser import ADC_RECORD_DTYPE, IMU_RECORD_DTYPE
+
+
+def _rows(array):
+    """Structured array -> list of field tuples (sequence_num signed, as in ADCRecord)"""
+    columns = [array[name] for name in array.dtype.names]
+    if 'sequence_num' in array.dtype.names:
+        columns[array.dtype.names.index('sequence_num')] = array['sequence_num'].view('<i4')
+    return list(zip(*(column.tolist() for column in columns)))
+
+
+def test_arrays_match_iterators(sample_logs):
+    adc_fields = [name for name, _ in ADC_RECORD_DTYPE]
+    imu_fields = [name for name, _ in IMU_RECORD_DTYPE]
+    for path in sample_logs:
+        with LogFile(str(path)) as log:
+            adc = [tuple(getattr(r, f) for f in adc_fields) for r in log.iter_adc()]
+            imu = [tuple(getattr(r, f) for f in imu_fields) for r in log.iter_imu()]
+            assert _rows(log.read_adc_array()) == adc, path.name
+            assert _rows(log.read_imu_array()) == imu, path.name
+            chunks = list(log.iter_adc_arrays(chunk_size=100))
+            assert _rows(np.concatenate(chunks)) == adc, path.name
+            assert (log.adc_count, log.imu_count) == (len(adc), len(imu)), path.name
+
+
+def test_iter_adc_decodes_the_written_records(sample_logs):
+    path = sample_logs[2]   # No end record or footer
+    data = path.read_bytes()
+    with LogFile(str(path)) as log:
+        records = list(log.iter_adc())
+    
+    # Four ADC records, then an IMU record
+    offsets = [64 + (i // 4) * 64 + (i % 4) * 12 for i in range(len(records))]
+    assert [(r.timestamp_offset_us, r.raw_adc, r.sequence_num) for r in records] == [
+        struct.unpack_from('<Iii', data, offset) for offset in offsets]
+    assert records[0].sequence_num == -5
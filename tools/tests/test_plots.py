@@ -0,0 +1,42 @@
+"""Plot data preparation: M4 downsampling against a per-bucket loop"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from loadcell_parser.plots import _m4_indices
+
+
+def _m4_reference(values, n_buckets):
+    """First, minimum, maximum and last index of each bucket, one bucket at a time"""
+    n = len(values)
+    size = -(-n // max(n_buckets, 1))
+    if size <= 4:
+        return list(range(n))
+    keep = set()
+    for start in range(0, n, size):
+        bucket = range(start, min(start + size, n))
+        keep.update((bucket[0], bucket[-1],
+                     min(bucket, key=values.__getitem__),
+                     max(bucket, key=values.__getitem__)))
+    return sorted(keep)
+
+
+@pytest.mark.parametrize('n, n_buckets', [
+    (0, 10), (3, 10), (40, 10), (41, 10), (1000, 7), (1001, 250), (12345, 1800),
+])
+def test_m4_matches_reference(n, n_buckets):
+    rnd = random.Random(n)
+    values = [rnd.randint(-50, 50) for _ in range(n)]   # Repeats: ties pick the first
+    kept = _m4_indices(np, np.array(values, dtype=np.int32), n_buckets)
+    assert kept.tolist() == _m4_reference(values, n_buckets)
+
+
+def test_m4_keeps_every_extreme():
+    values = np.zeros(100_000)
+    values[[1, 33_333, 77_777, 99_998]] = [5.0, -7.0, 9.0, -3.0]
+    kept = _m4_indices(np, values, 900).tolist()
+    assert {1, 33_333, 77_777, 99_998} <= set(kept)
+    assert len(kept) <= 4 * 900
@@ -0,0 +1,88 @@
+"""validate_file: numpy scan against the pure-Python one"""
+
+import zlib
+from pathlib import Path
+
+import pytest
+
+# Each test compares the numpy path with the fallback
+pytest.importorskip('numpy')
+
+from loadcell_parser import LogFile, validate_file
+from loadcell_parser import validator
+
+
+def _damaged_copies(path: Path):
+    """The log, plus copies with a flipped data byte, a zeroed record and a cut tail"""
+    data = path.read_bytes()
+    yield path
+    for name, damaged in [
+        ('flipped', data[:500] + bytes([data[500] ^ 0x10]) + data[501:]),
+        ('zeroed', data[:200] + bytes(12) + data[212:]),
+        ('cut', data[:len(data) - 45]),
+    ]:
+        copy = path.with_name(f'{path.stem}_{name}.bin')
+        copy.write_bytes(damaged)
+        yield copy
+
+
+@pytest.mark.parametrize('check_crc, check_gaps', [(True, True), (False, True), (True, False)])
+def test_reports_match_fallback(sample_logs, without_numpy, monkeypatch, check_crc, check_gaps):
+    # Small chunks, so gaps and the CRC cross chunk boundaries
+    monkeypatch.setattr(validator, 'ADC_CHUNK_RECORDS', 100)
+    for original in sample_logs:
+        for path in _damaged_copies(original):
+            fast = validate_file(str(path), check_crc=check_crc, check_gaps=check_gaps)
+            with without_numpy():
+                slow = validate_file(str(path), check_crc=check_crc, check_gaps=check_gaps)
+            assert fast == slow, path.name
+
+
+def test_sample_log_is_valid_with_gaps(sample_logs):
+    report = validate_file(str(sample_logs[0]))
+    assert report.is_valid
+    assert report.crc_computed == report.crc_expected
+    # As the initial commit reports them: sequence numbers start at 0, are
+    # signed and are not wrapped around
+    assert [(gap.expected_seq, gap.actual_seq) for gap in report.gaps] == [
+        (0, -5), (700, 710), (1500, 0x7FFFFFFF), (0x7FFFFFFF + 1, -0x80000000),
+        (-0x80000000 + 1, 3)]
+
+
+def test_log_mapping_is_closed(sample_logs, monkeypatch):
+    closed = []
+    close = LogFile.close
+    
+    def spy(log):
+        mapping = log._mm
+        close(log)
+        closed.append(mapping.closed)   # False if a view still exported it
+    
+    monkeypatch.setattr(LogFile, 'close', spy)
+    for path in sample_logs:
+        validate_file(str(path))
+    assert closed == [True] * len(sample_logs)
+
+
+class _BytesOnlyCRC:
+    """A fastcrc.crc32 stand-in that, like some releases, rejects memoryview"""
+    
+    @staticmethod
+    def iso_hdlc(data, crc=0):
+        if not isinstance(data, bytes):
+            raise TypeError('argument must be bytes')
+        return zlib.crc32(data, crc)
+
+
+@pytest.mark.parametrize('crc_module', [
+    None, _BytesOnlyCRC, pytest.param('fastcrc', id='fastcrc')])
+def test_crc_with_and_without_fastcrc(sample_logs, monkeypatch, crc_module):
+    if crc_module == 'fastcrc':
+        crc_module = pytest.importorskip('fastcrc').crc32
+    monkeypatch.setattr(validator, 'fastcrc32', crc_module)
+    monkeypatch.setattr(validator, 'CRC_CHUNK_SIZE', 4096)
+    for path in sample_logs[:2]:
+        data = path.read_bytes()
+        report = validate_file(str(path))
+        assert report.crc_computed == zlib.crc32(data[:-32])
+        assert report.is_valid
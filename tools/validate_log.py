@@ -10,20 +10,63 @@ Validates binary log files for integrity, checking:
 
 Usage:
     python validate_log.py <logfile.bin> [--no-crc] [--json]
-    python validate_log.py --batch <directory> [--json]
+    python validate_log.py --batch <directory> [--jobs N] [--json]
 """
 
 import argparse
 import sys
 import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from loadcell_parser import LogFile, validate_file, ValidationReport
 
 
+def _validate_one(filepath: Path, check_crc: bool, check_gaps: bool) -> ValidationReport:
+    """validate_file() for one path (module-level so worker processes can run it)"""
+    return validate_file(str(filepath), check_crc=check_crc, check_gaps=check_gaps)
+
+
+def _report_dict(r: ValidationReport) -> dict:
+    """JSON output entry for one report"""
+    return {
+        'filepath': r.filepath,
+        'is_valid': r.is_valid,
+        'header_valid': r.header_valid,
+        'footer_valid': r.footer_valid,
+        'footer_present': r.footer_present,
+        'crc_valid': r.crc_valid,
+        'crc_expected': f"0x{r.crc_expected:08X}",
+        'crc_computed': f"0x{r.crc_computed:08X}",
+        'adc_count': r.adc_count,
+        'imu_count': r.imu_count,
+        'gaps_count': len(r.gaps),
+        'total_missing': r.total_missing,
+        'errors': r.errors,
+        'warnings': r.warnings,
+    }
+
+
+def _print_json(data) -> None:
+    """Write data to stdout as indented JSON (uses orjson when installed)"""
+    if orjson is not None:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    else:
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Validate loadcell binary log files',
@@ -36,6 +79,9 @@ Examples:
     # Validate all .bin files in a directory
     python validate_log.py --batch data/
     
+    # ... in 2 worker processes
+    python validate_log.py --batch data/ --jobs 2
+    
     # Output as JSON
     python validate_log.py data/log_001.bin --json
     
@@ -47,6 +93,8 @@ Examples:
     parser.add_argument('filepath', nargs='?', help='Path to log file')
     parser.add_argument('--batch', '-b', metavar='DIR', 
                        help='Validate all .bin files in directory')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                       help='Worker processes for --batch (default: 1)')
     parser.add_argument('--no-crc', action='store_true',
                        help='Skip CRC32 verification (faster)')
     parser.add_argument('--no-gaps', action='store_true',
@@ -61,6 +109,8 @@ Examples:
     if not args.filepath and not args.batch:
         parser.print_help()
         sys.exit(1)
+    if args.jobs < 1:
+        parser.error("argument --jobs: must be at least 1")
     
     # Collect files to validate
     files = []
@@ -77,46 +127,33 @@ Examples:
         files = [Path(args.filepath)]
     
     # Validate files
-    results = []
     all_valid = True
     
+    found = []
     for filepath in files:
         if not filepath.exists():
             print(f"Error: File not found: {filepath}", file=sys.stderr)
             all_valid = False
             continue
-        
-        report = validate_file(
-            str(filepath),
-            check_crc=not args.no_crc,
-            check_gaps=not args.no_gaps
-        )
-        
-        results.append(report)
-        if not report.is_valid:
-            all_valid = False
+        found.append(filepath)
+    
+    # Files are independent: validate a batch in worker processes (reports
+    # come back in file order); a single file needs no pool
+    check_args = (found, repeat(not args.no_crc), repeat(not args.no_gaps))
+    jobs = min(args.jobs, len(found))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_validate_one, *check_args))
+    else:
+        results = list(map(_validate_one, *check_args))
+    
+    if not all(report.is_valid for report in results):
+        all_valid = False
     
     # Output results
     if args.json:
-        output = []
-        for r in results:
-            output.append({
-                'filepath': r.filepath,
-                'is_valid': r.is_valid,
-                'header_valid': r.header_valid,
-                'footer_valid': r.footer_valid,
-                'footer_present': r.footer_present,
-                'crc_valid': r.crc_valid,
-                'crc_expected': f"0x{r.crc_expected:08X}",
-                'crc_computed': f"0x{r.crc_computed:08X}",
-                'adc_count': r.adc_count,
-                'imu_count': r.imu_count,
-                'gaps_count': len(r.gaps),
-                'total_missing': r.total_missing,
-                'errors': r.errors,
-                'warnings': r.warnings,
-            })
-        print(json.dumps(output if len(output) > 1 else output[0], indent=2))
+        output = [_report_dict(r) for r in results]
+        _print_json(output if len(output) > 1 else output[0])
     else:
         for report in results:
             print(report.summary())